@@ -0,0 +1,49 @@
+"""
+Numba kernel for Monte Carlo VaR
+Fuses return simulation and the tail order statistic into one compiled function
+"""
+import numpy as np
+
+from utils.jit import NUMBA_AVAILABLE, njit, prange
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def mc_var(
+    mean: float,
+    std: float,
+    holding_period: int,
+    simulations: int,
+    confidence_level: float,
+    portfolio_value: float,
+) -> float:
+    """
+    Simulate normal returns and return VaR in currency
+
+    Args:
+        mean: Mean daily return
+        std: Standard deviation of daily returns
+        holding_period: Holding period in days
+        simulations: Number of simulations
+        confidence_level: Confidence level for VaR
+        portfolio_value: Current portfolio value
+
+    Returns:
+        VaR value in currency
+    """
+    drift = np.float32(mean * holding_period)
+    scale = np.float32(std * np.sqrt(holding_period))
+
+    simulated_returns = np.empty(simulations, dtype=np.float32)
+
+    # Antithetic variates: each draw also contributes its mirror image
+    half = simulations // 2
+    for i in prange(half):
+        shock = scale * np.random.standard_normal()
+        simulated_returns[i] = drift + shock
+        simulated_returns[half + i] = drift - shock
+    if simulations % 2:
+        simulated_returns[simulations - 1] = drift + scale * np.random.standard_normal()
+
+    # Lower order statistic, the same rule as the NumPy fallback and historical VaR
+    k = int((1.0 - confidence_level) * (simulations - 1))
+    return -portfolio_value * np.partition(simulated_returns, k)[k]
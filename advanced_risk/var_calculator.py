@@ -3,12 +3,17 @@ Advanced Risk Management - Value at Risk (VaR) Calculator
 """
 import numpy as np
 import pandas as pd
+from scipy.special import ndtri
 from typing import Dict, List, Optional
 from loguru import logger
 
+from advanced_risk._mc_kernel import NUMBA_AVAILABLE, mc_var
 from core.risk_manager import risk_manager
 from core.signal_engine import signal_engine
 
+# Shared PCG64 generator for Monte Carlo simulations
+_rng = np.random.default_rng()
+
 
 class VaRCalculator:
     """
@@ -26,6 +31,8 @@ class VaRCalculator:
             confidence_level: Confidence level for VaR (default 95%)
         """
         self.confidence_level = confidence_level
+        self._z_score = ndtri(1 - confidence_level)
+        self._mc_buf: Optional[np.ndarray] = None
 
     def calculate_historical_var(
         self,
@@ -46,13 +53,17 @@ class VaRCalculator:
             logger.warning("Insufficient data for VaR calculation")
             return 0.0
 
-        # Scale returns for holding period
-        scaled_returns = returns * np.sqrt(holding_period)
+        # Scale returns for holding period (float32 is well below percentile noise)
+        scaled_returns = np.asarray(returns, dtype=np.float32) * np.float32(
+            np.sqrt(holding_period)
+        )
 
-        # Calculate VaR as percentile
-        var = np.percentile(scaled_returns, (1 - self.confidence_level) * 100)
+        # VaR is a single order statistic, so quickselect in place instead of sorting
+        k = int((1 - self.confidence_level) * (len(scaled_returns) - 1))
+        scaled_returns.partition(k)
+        var = scaled_returns[k]
 
-        return abs(var)
+        return abs(float(var))
 
     def calculate_parametric_var(
         self,
@@ -72,16 +83,13 @@ class VaRCalculator:
         if len(returns) < 30:
             return 0.0
 
-        # Calculate mean and std
-        mean = returns.mean()
-        std = returns.std()
-
-        # Z-score for confidence level
-        from scipy.stats import norm
-        z_score = norm.ppf(1 - self.confidence_level)
+        r = np.asarray(returns, dtype=np.float64)
+        return self._parametric_var(float(r.mean()), float(r.std(ddof=1)), holding_period)
 
-        # VaR formula
-        var = -(mean + z_score * std) * np.sqrt(holding_period)
+    def _parametric_var(self, mean: float, std: float, holding_period: int) -> float:
+        """Parametric VaR from precomputed return statistics"""
+        # VaR formula (z-score for confidence level cached at init)
+        var = -(mean + self._z_score * std) * np.sqrt(holding_period)
 
         return abs(var)
 
@@ -91,6 +99,7 @@ class VaRCalculator:
         portfolio_value: float,
         holding_period: int = 1,
         simulations: int = 10000,
+        seed: Optional[int] = None,
     ) -> float:
         """
         Calculate Monte Carlo VaR
@@ -100,6 +109,7 @@ class VaRCalculator:
             portfolio_value: Current portfolio value
             holding_period: Holding period in days
             simulations: Number of simulations
+            seed: Optional RNG seed for reproducible runs
 
         Returns:
             VaR value in currency
@@ -107,26 +117,112 @@ class VaRCalculator:
         if len(returns) < 30:
             return 0.0
 
-        mean = returns.mean()
-        std = returns.std()
-
-        # Generate random returns
-        simulated_returns = np.random.normal(
-            mean * holding_period,
-            std * np.sqrt(holding_period),
-            simulations
+        r = np.asarray(returns, dtype=np.float64)
+        return self._monte_carlo_var(
+            float(r.mean()),
+            float(r.std(ddof=1)),
+            portfolio_value,
+            holding_period,
+            simulations,
+            seed,
         )
 
-        # Calculate portfolio values
-        simulated_values = portfolio_value * (1 + simulated_returns)
+    def _monte_carlo_var(
+        self,
+        mean: float,
+        std: float,
+        portfolio_value: float,
+        holding_period: int = 1,
+        simulations: int = 10000,
+        seed: Optional[int] = None,
+    ) -> float:
+        """Monte Carlo VaR from precomputed return statistics"""
+        # Compiled kernel fuses simulation and quantile when Numba is installed
+        if NUMBA_AVAILABLE and seed is None:
+            return float(
+                mc_var(
+                    mean,
+                    std,
+                    holding_period,
+                    simulations,
+                    self.confidence_level,
+                    portfolio_value,
+                )
+            )
+
+        # Generate random returns in place, reusing the buffer across calls
+        if self._mc_buf is None or len(self._mc_buf) != simulations:
+            self._mc_buf = np.empty(simulations, dtype=np.float32)
+        simulated_returns = self._mc_buf
+        rng = _rng if seed is None else np.random.default_rng(seed)
+        drift = np.float32(mean * holding_period)
+
+        # Antithetic variates: mirror half the draws around the drift
+        half = simulations // 2
+        head = simulated_returns[:half]
+        rng.standard_normal(half, dtype=np.float32, out=head)
+        head *= np.float32(std * np.sqrt(holding_period))
+        head += drift
+        np.subtract(2 * drift, head, out=simulated_returns[half:2 * half])
+        if simulations % 2:
+            simulated_returns[-1] = drift + std * np.sqrt(holding_period) * rng.standard_normal()
+
+        # Loss percentile is the mirrored return quantile scaled by portfolio value;
+        # quickselect the lower order statistic in place on the scratch buffer
+        k = int((1 - self.confidence_level) * (simulations - 1))
+        simulated_returns.partition(k)
+        var = -portfolio_value * float(simulated_returns[k])
+
+        return float(var)
+
+    def calculate_all_var(
+        self,
+        returns: pd.Series,
+        portfolio_value: float,
+        holding_period: int = 1,
+        simulations: int = 10000,
+    ) -> Dict[str, float]:
+        """
+        Calculate historical, parametric and Monte Carlo VaR together
+
+        Mean, std and the tail order statistic are derived from shared
+        passes over the returns instead of one scan per method.
 
-        # Calculate losses
-        losses = portfolio_value - simulated_values
+        Args:
+            returns: Historical returns series
+            portfolio_value: Current portfolio value
+            holding_period: Holding period in days
+            simulations: Number of Monte Carlo simulations
 
-        # VaR is the percentile of losses
-        var = np.percentile(losses, self.confidence_level * 100)
+        Returns:
+            Dictionary of VaR values in currency keyed by method
+        """
+        n = len(returns)
+        if n < 30:
+            logger.warning("Insufficient data for VaR calculation")
+            return {"historical": 0.0, "parametric": 0.0, "monte_carlo": 0.0}
+
+        r = np.asarray(returns, dtype=np.float64)
+
+        # Mean and sample std from one pass of sums
+        total = float(np.add.reduce(r))
+        total_sq = float(np.add.reduce(r * r))
+        mean = total / n
+        std = float(np.sqrt(max(total_sq - total * mean, 0.0) / (n - 1)))
+
+        # Historical tail via quickselect on a float32 copy
+        tail = r.astype(np.float32)
+        k = int((1 - self.confidence_level) * (n - 1))
+        tail.partition(k)
+        historical = abs(float(tail[k])) * float(np.sqrt(holding_period))
 
-        return var
+        return {
+            "historical": historical * portfolio_value,
+            "parametric": float(self._parametric_var(mean, std, holding_period)) * portfolio_value,
+            "monte_carlo": self._monte_carlo_var(
+                mean, std, portfolio_value, holding_period, simulations
+            ),
+        }
 
     def calculate_portfolio_var(
         self,
@@ -147,27 +243,47 @@ class VaRCalculator:
         portfolio_summary = risk_manager.get_portfolio_summary()
         total_value = portfolio_summary["total_value"]
 
-        # Calculate portfolio returns (simplified - using first position)
-        returns_list = []
-        for symbol in risk_manager.positions:
+        # Collect close prices and position values
+        closes_list = []
+        position_values = []
+        for symbol, position in risk_manager.positions.items():
             history = signal_engine.price_histories.get(symbol)
             if history and len(history) >= 30:
-                df = history.get_dataframe()
-                returns = df["close"].pct_change().dropna()
-                returns_list.append(returns)
+                closes_list.append(np.asarray(history.prices, dtype=np.float64))
+                position_values.append(position.quantity * position.current_price)
 
-        if not returns_list:
+        if not closes_list:
             return {"error": "Insufficient data for VaR calculation"}
 
-        # Use first available returns (simplified)
-        returns = returns_list[0]
+        # Stack the common tail into one (T, K) matrix; returns for all symbols in one pass
+        length = min(len(c) for c in closes_list)
+        closes = np.column_stack([c[len(c) - length:] for c in closes_list])
+        returns_matrix = closes[1:] / closes[:-1] - 1
+
+        # Weights relative to total value (cash contributes a zero return)
+        weights = np.asarray(position_values, dtype=np.float64)
+        if total_value > 0:
+            weights /= total_value
+
+        # Portfolio returns with one matrix-vector product. Their mean and std are
+        # recomputed on every call on purpose: columns are each symbol's own tick
+        # history aligned from the end, so any symbol's new tick re-pairs every row
+        # and running (Welford) sums kept between calls would not stay exact
+        returns = returns_matrix @ weights
+        mean = float(returns.mean())
+        std = float(returns.std(ddof=1))
+        enough_data = len(returns) >= 30
 
         if method == "historical":
             var_pct = self.calculate_historical_var(returns, holding_period)
         elif method == "parametric":
-            var_pct = self.calculate_parametric_var(returns, holding_period)
+            var_pct = self._parametric_var(mean, std, holding_period) if enough_data else 0.0
         elif method == "monte_carlo":
-            var_value = self.calculate_monte_carlo_var(returns, total_value, holding_period)
+            var_value = (
+                self._monte_carlo_var(mean, std, total_value, holding_period)
+                if enough_data
+                else 0.0
+            )
             return {
                 "method": method,
                 "var_value": var_value,
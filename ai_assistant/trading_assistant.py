@@ -2,26 +2,26 @@
 AI Trading Assistant
 Natural language interface for trading operations using LLM
 """
-from typing import Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
 import json
-from datetime import datetime
+import re
+from collections import OrderedDict, deque
 from loguru import logger
 
-# LangChain imports (will be optional dependencies)
-try:
-    from langchain.chat_models import ChatOpenAI
-    from langchain.agents import AgentExecutor, create_openai_functions_agent
-    from langchain.tools import Tool
-    from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
-    logger.warning("LangChain not installed. AI Assistant will have limited functionality.")
-
 from core.price_stream import price_stream_manager
 from core.risk_manager import risk_manager
 from core.order_executor import order_executor, OrderSide, OrderType
 from core.signal_engine import signal_engine
+from utils.config import settings
+
+# Three-letter ticker tokens in an upper-cased message
+_SYMBOL_RE = re.compile(r"\b[A-Z]{3}\b")
+
+# Compact JSON for tool output; the LLM pays per token, not for readability
+_JSON_ARGS = dict(separators=(",", ":"), default=str)
+
+# Max cached tool results keyed by (tool, symbol, tick timestamp)
+ANALYSIS_CACHE_SIZE = 256
 
 
 class TradingAssistant:
@@ -39,13 +39,25 @@ class TradingAssistant:
         self.api_key = api_key
         self.llm = None
         self.agent_executor = None
-        self.conversation_history = []
+        # Two messages per turn; only role/content is kept for the LLM
+        self.conversation_history = deque(maxlen=settings.chat_history_turns * 2)
+        self._analysis_cache: "OrderedDict[Tuple[str, str, Any], str]" = OrderedDict()
 
-        if LANGCHAIN_AVAILABLE and api_key:
+        if api_key:
             self._initialize_agent()
 
     def _initialize_agent(self):
         """Initialize LangChain agent with trading tools"""
+        # LangChain is optional and slow to import, so only load it when an agent is built
+        try:
+            from langchain.chat_models import ChatOpenAI
+            from langchain.agents import AgentExecutor, create_openai_functions_agent
+            from langchain.tools import Tool
+            from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+        except ImportError:
+            logger.warning("LangChain not installed. AI Assistant will have limited functionality.")
+            return
+
         # Initialize LLM
         self.llm = ChatOpenAI(
             api_key=self.api_key,
@@ -122,12 +134,12 @@ class TradingAssistant:
             "change_percent": price_data.change_percent,
             "volume": price_data.volume,
             "timestamp": price_data.timestamp.isoformat(),
-        })
+        }, **_JSON_ARGS)
 
     def _get_portfolio(self, _: str = "") -> str:
         """Get portfolio summary"""
-        summary = risk_manager.get_portfolio_summary()
-        return json.dumps(summary, indent=2)
+        summary = risk_manager.get_portfolio_summary(include_positions=True)
+        return json.dumps(summary, **_JSON_ARGS)
 
     def _get_signals(self, symbol: str) -> str:
         """Get trading signals"""
@@ -135,11 +147,16 @@ class TradingAssistant:
         if not price_data:
             return f"No price data available for {symbol}"
 
+        key = ("signals", symbol.upper(), price_data.timestamp)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
         signal = signal_engine.generate_signal(symbol.upper(), price_data.price)
         if not signal:
             return "Insufficient data for signal generation"
 
-        return json.dumps(signal.to_dict(), indent=2)
+        return self._cache_put(key, json.dumps(signal.to_dict(), **_JSON_ARGS))
 
     def _place_order(self, order_json: str) -> str:
         """Place trading order"""
@@ -177,6 +194,12 @@ class TradingAssistant:
         if not price_data:
             return f"No data available for {symbol}"
 
+        # Indicators only change when a new tick arrives
+        key = ("analyze", symbol, price_data.timestamp)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
         # Get signal
         signal = signal_engine.generate_signal(symbol, price_data.price)
 
@@ -201,7 +224,21 @@ class TradingAssistant:
             "signal": signal.to_dict() if signal else None,
         }
 
-        return json.dumps(analysis, indent=2)
+        return self._cache_put(key, json.dumps(analysis, **_JSON_ARGS))
+
+    def _cache_get(self, key: Tuple[str, str, Any]) -> Optional[str]:
+        """Look up a cached tool result and mark it recently used"""
+        result = self._analysis_cache.get(key)
+        if result is not None:
+            self._analysis_cache.move_to_end(key)
+        return result
+
+    def _cache_put(self, key: Tuple[str, str, Any], result: str) -> str:
+        """Store a tool result, evicting the least recently used entry"""
+        self._analysis_cache[key] = result
+        if len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return result
 
     def chat(self, message: str) -> str:
         """
@@ -213,26 +250,18 @@ class TradingAssistant:
         Returns:
             Assistant response
         """
-        if not LANGCHAIN_AVAILABLE or not self.agent_executor:
+        if not self.agent_executor:
             return self._basic_response(message)
 
         try:
             response = self.agent_executor.invoke({
                 "input": message,
-                "chat_history": self.conversation_history,
+                "chat_history": list(self.conversation_history),
             })
 
             # Update conversation history
-            self.conversation_history.append({
-                "role": "user",
-                "content": message,
-                "timestamp": datetime.now().isoformat(),
-            })
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": response["output"],
-                "timestamp": datetime.now().isoformat(),
-            })
+            self.conversation_history.append({"role": "user", "content": message})
+            self.conversation_history.append({"role": "assistant", "content": response["output"]})
 
             return response["output"]
 
@@ -243,23 +272,19 @@ class TradingAssistant:
     def _basic_response(self, message: str) -> str:
         """Basic responses without LLM (fallback)"""
         message_lower = message.lower()
+        symbol = _SYMBOL_RE.search(message.upper())
 
         if "price" in message_lower or "giá" in message_lower:
-            # Try to extract symbol
-            words = message.upper().split()
-            for word in words:
-                if len(word) == 3 and word.isalpha():
-                    return self._get_price(word)
+            if symbol:
+                return self._get_price(symbol.group())
             return "Please specify a symbol (e.g., 'price of VCB')"
 
         elif "portfolio" in message_lower or "danh mục" in message_lower:
             return self._get_portfolio()
 
         elif "signal" in message_lower or "tín hiệu" in message_lower:
-            words = message.upper().split()
-            for word in words:
-                if len(word) == 3 and word.isalpha():
-                    return self._get_signals(word)
+            if symbol:
+                return self._get_signals(symbol.group())
             return "Please specify a symbol for signals"
 
         else:
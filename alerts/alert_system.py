@@ -2,20 +2,39 @@
 Multi-Channel Alert System
 Sends alerts via Telegram, Discord, Email, SMS, Webhook
 """
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Sequence
 from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime
+from collections import deque
+from itertools import islice
 import asyncio
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
 
 from utils.config import settings
 from utils.notifications import NotificationManager
 
+# Shared keep-alive session for Discord/webhook posts
+_http = requests.Session()
+_http.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.1),
+    ),
+)
+
+# Seconds before a stuck webhook is abandoned
+WEBHOOK_TIMEOUT = 5
+
 
 class AlertChannel(Enum):
     """Alert delivery channels"""
@@ -34,6 +53,11 @@ class AlertPriority(Enum):
     CRITICAL = 4
 
 
+# Emoji and Discord embed color per priority, indexed by AlertPriority.value - 1
+_PRIORITY_EMOJI = ("ℹ️", "⚠️", "🔔", "🚨")
+_PRIORITY_COLOR = (0x00FF00, 0xFFFF00, 0xFF9900, 0xFF0000)
+
+
 @dataclass
 class Alert:
     """Alert model"""
@@ -159,9 +183,28 @@ class AlertSystem:
 
     def __init__(self):
         self.rules: List[AlertRule] = []
-        self.alert_history: List[Alert] = []
+        self._rules_by_symbol: Dict[str, List[PriceAlert]] = {}
+        self._generic_rules: List[AlertRule] = []
+
+        # Per-symbol threshold vectors for batch evaluation (rebuilt lazily)
+        self._symbol_index: Dict[str, int] = {}
+        self._above_thr = np.empty(0)
+        self._below_thr = np.empty(0)
+        self._thresholds_dirty = True
+        self.alert_history: deque = deque(maxlen=settings.alert_history_max)
+        # Deliveries scheduled on a running loop; the loop only keeps weak
+        # references, so hold them until they finish
+        self._pending: set = set()
         self.notification_manager = NotificationManager()
 
+        # Blocking sender per channel, built once rather than per dispatch
+        self._senders: Dict[AlertChannel, Callable[[Alert], None]] = {
+            AlertChannel.TELEGRAM: self._send_telegram,
+            AlertChannel.DISCORD: self._send_discord,
+            AlertChannel.EMAIL: self._send_email,
+            AlertChannel.WEBHOOK: self._send_webhook,
+        }
+
         # Discord webhook
         self.discord_webhook_url = None
 
@@ -184,11 +227,81 @@ class AlertSystem:
     def add_rule(self, rule: AlertRule):
         """Add alert rule"""
         self.rules.append(rule)
+        if isinstance(rule, PriceAlert):
+            self._rules_by_symbol.setdefault(rule.symbol, []).append(rule)
+            self._thresholds_dirty = True
+        else:
+            self._generic_rules.append(rule)
         logger.info(f"Added alert rule: {rule.name}")
 
     def remove_rule(self, rule_name: str):
         """Remove alert rule"""
         self.rules = [r for r in self.rules if r.name != rule_name]
+        self._generic_rules = [r for r in self._generic_rules if r.name != rule_name]
+        for symbol, rules in list(self._rules_by_symbol.items()):
+            remaining = [r for r in rules if r.name != rule_name]
+            if remaining:
+                self._rules_by_symbol[symbol] = remaining
+            else:
+                del self._rules_by_symbol[symbol]
+        self._thresholds_dirty = True
+
+    def evaluate_price(self, symbol: str, price: float):
+        """Evaluate only the price rules registered for a symbol"""
+        for rule in self._rules_by_symbol.get(symbol, ()):
+            if not rule.enabled:
+                continue
+            alert = rule.evaluate(price)
+            if alert:
+                self.send_alert(alert)
+
+    def evaluate_batch(self, symbols: Sequence[str], prices: np.ndarray):
+        """
+        Evaluate price rules for a batch of ticks
+
+        Each symbol keeps its lowest "above" and highest "below" threshold,
+        so one vector compare finds the ticks that can fire; only those are
+        evaluated rule by rule.
+        """
+        if not self._rules_by_symbol:
+            return
+        if self._thresholds_dirty:
+            self._build_threshold_index()
+
+        prices = np.asarray(prices, dtype=np.float64)
+        idx = np.fromiter(
+            (self._symbol_index.get(s, -1) for s in symbols), dtype=np.intp, count=len(symbols)
+        )
+        known = idx >= 0
+        fired = np.flatnonzero(
+            known & ((prices > self._above_thr[idx]) | (prices < self._below_thr[idx]))
+        )
+
+        for i in fired:
+            self.evaluate_price(symbols[i], float(prices[i]))
+
+    def _build_threshold_index(self):
+        """Rebuild per-symbol threshold vectors from the price rules"""
+        self._symbol_index = {s: i for i, s in enumerate(self._rules_by_symbol)}
+        self._above_thr = np.full(len(self._symbol_index), np.inf)
+        self._below_thr = np.full(len(self._symbol_index), -np.inf)
+
+        for symbol, i in self._symbol_index.items():
+            for rule in self._rules_by_symbol[symbol]:
+                if rule.condition == "above":
+                    self._above_thr[i] = min(self._above_thr[i], rule.threshold)
+                elif rule.condition == "below":
+                    self._below_thr[i] = max(self._below_thr[i], rule.threshold)
+
+        self._thresholds_dirty = False
+
+    def evaluate_portfolio(self, pnl_percent: float):
+        """Evaluate portfolio P&L rules"""
+        for rule in self._generic_rules:
+            if rule.enabled and isinstance(rule, PortfolioAlert):
+                alert = rule.evaluate(pnl_percent)
+                if alert:
+                    self.send_alert(alert)
 
     def configure_discord(self, webhook_url: str):
         """Configure Discord webhook"""
@@ -213,33 +326,43 @@ class AlertSystem:
 
     def send_alert(self, alert: Alert):
         """Send alert via configured channels"""
+        self.alert_history.append(alert)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(self._deliver(alert))
+        else:
+            # Already inside an event loop: fan out in the background
+            task = loop.create_task(self._deliver(alert))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def send_alert_async(self, alert: Alert):
+        """Send alert to all channels concurrently"""
+        self.alert_history.append(alert)
+        await self._deliver(alert)
+
+    async def _deliver(self, alert: Alert):
+        """Send alert to all channels concurrently, without recording it"""
         logger.info(f"Sending alert: {alert.title} via {[c.value for c in alert.channels]}")
 
-        for channel in alert.channels:
-            try:
-                if channel == AlertChannel.TELEGRAM:
-                    self._send_telegram(alert)
-                elif channel == AlertChannel.DISCORD:
-                    self._send_discord(alert)
-                elif channel == AlertChannel.EMAIL:
-                    self._send_email(alert)
-                elif channel == AlertChannel.WEBHOOK:
-                    self._send_webhook(alert)
-            except Exception as e:
-                logger.error(f"Failed to send alert via {channel.value}: {e}")
+        await asyncio.gather(*(self._dispatch(channel, alert) for channel in alert.channels))
 
-        self.alert_history.append(alert)
+    async def _dispatch(self, channel: AlertChannel, alert: Alert):
+        """Run a blocking channel sender in a worker thread"""
+        sender = self._senders.get(channel)
+        if sender is None:
+            return
+
+        try:
+            await asyncio.to_thread(sender, alert)
+        except Exception as e:
+            logger.error(f"Failed to send alert via {channel.value}: {e}")
 
     def _send_telegram(self, alert: Alert):
         """Send via Telegram"""
-        emoji = {
-            AlertPriority.LOW: "ℹ️",
-            AlertPriority.MEDIUM: "⚠️",
-            AlertPriority.HIGH: "🔔",
-            AlertPriority.CRITICAL: "🚨",
-        }
-
-        message = f"{emoji[alert.priority]} {alert.title}\n\n{alert.message}"
+        emoji = _PRIORITY_EMOJI[alert.priority.value - 1]
+        message = f"{emoji} {alert.title}\n\n{alert.message}"
         self.notification_manager.send_notification(message)
 
     def _send_discord(self, alert: Alert):
@@ -248,26 +371,19 @@ class AlertSystem:
             logger.warning("Discord webhook not configured")
             return
 
-        color = {
-            AlertPriority.LOW: 0x00FF00,
-            AlertPriority.MEDIUM: 0xFFFF00,
-            AlertPriority.HIGH: 0xFF9900,
-            AlertPriority.CRITICAL: 0xFF0000,
-        }
-
         payload = {
             "embeds": [
                 {
                     "title": alert.title,
                     "description": alert.message,
-                    "color": color[alert.priority],
+                    "color": _PRIORITY_COLOR[alert.priority.value - 1],
                     "timestamp": alert.timestamp.isoformat(),
                     "footer": {"text": "DNSE Insight Alert System"},
                 }
             ]
         }
 
-        response = requests.post(self.discord_webhook_url, json=payload)
+        response = _http.post(self.discord_webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
         response.raise_for_status()
 
     def _send_email(self, alert: Alert):
@@ -314,12 +430,15 @@ class AlertSystem:
             "metadata": alert.metadata,
         }
 
-        response = requests.post(self.custom_webhook_url, json=payload)
+        response = _http.post(self.custom_webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
         response.raise_for_status()
 
     def get_alert_history(self, limit: int = 100) -> List[Alert]:
         """Get recent alerts"""
-        return self.alert_history[-limit:]
+        # Walk back from the newest entry so only `limit` items are touched
+        recent = list(islice(reversed(self.alert_history), limit))
+        recent.reverse()
+        return recent
 
 
 # Global instance
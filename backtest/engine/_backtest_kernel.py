@@ -0,0 +1,80 @@
+"""
+Numba kernel for the backtest accounting loop
+Signals and position sizes are computed beforehand; this only tracks position and capital
+"""
+import numpy as np
+
+from utils.jit import njit
+
+# Signal codes passed into the kernel
+SIGNAL_NONE = -1
+SIGNAL_HOLD = 0
+SIGNAL_BUY = 1
+SIGNAL_SELL = 2
+SIGNAL_CUTLOSS = 3
+
+# Codes at or above this close the open position (SELL, CUTLOSS)
+SIGNAL_CLOSE_MIN = SIGNAL_SELL
+
+
+@njit(cache=True)
+def backtest_loop(
+    closes: np.ndarray,
+    signals: np.ndarray,
+    quantities: np.ndarray,
+    initial_capital: float,
+):
+    """
+    Replay signals bar by bar and account for one long position at a time
+
+    Args:
+        closes: Close price per bar
+        signals: Signal code per bar (SIGNAL_* constants)
+        quantities: Position size to buy on each BUY bar
+        initial_capital: Starting capital
+
+    Returns:
+        (entry_idx, exit_idx, trade_qty, n_trades, equity, recorded, capital)
+        where the trade arrays are valid up to n_trades and equity is valid
+        where recorded is True
+    """
+    n = len(closes)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    trade_qty = np.empty(n, dtype=np.int64)
+    equity = np.empty(n, dtype=np.float64)
+    recorded = np.zeros(n, dtype=np.bool_)
+
+    capital = initial_capital
+    n_trades = 0
+    open_idx = -1
+    open_qty = 0
+
+    for i in range(n):
+        signal = signals[i]
+        if signal == SIGNAL_NONE:
+            continue
+
+        close = closes[i]
+
+        if signal == SIGNAL_BUY and open_idx < 0:
+            qty = quantities[i]
+            if qty > 0:
+                open_idx = i
+                open_qty = qty
+                capital -= qty * close
+
+        elif signal >= SIGNAL_CLOSE_MIN and open_idx >= 0:
+            entry_idx[n_trades] = open_idx
+            exit_idx[n_trades] = i
+            trade_qty[n_trades] = open_qty
+            n_trades += 1
+
+            capital += open_qty * close
+            open_idx = -1
+            open_qty = 0
+
+        equity[i] = capital + open_qty * close if open_idx >= 0 else capital
+        recorded[i] = True
+
+    return entry_idx, exit_idx, trade_qty, n_trades, equity, recorded, capital
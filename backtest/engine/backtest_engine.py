@@ -2,14 +2,44 @@
 Backtesting Engine
 Test trading strategies using historical data
 """
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import numpy as np
 import pandas as pd
 from loguru import logger
 
-from core.signal_engine import SignalEngine, SignalType
+from core.signal_engine import SignalType
 from core.risk_manager import RiskManager
+from utils.config import settings
+from backtest.engine._backtest_kernel import (
+    SIGNAL_NONE,
+    SIGNAL_HOLD,
+    SIGNAL_BUY,
+    SIGNAL_SELL,
+    SIGNAL_CUTLOSS,
+    backtest_loop,
+)
+
+# Mirrors PriceHistory's default size and generate_signal's minimum history
+PRICE_HISTORY_SIZE = 500
+MIN_SIGNAL_HISTORY = 30
+
+# Stop loss placed 3% under entry when sizing positions
+STOP_LOSS_RATIO = 0.97
+
+# Annualization factor for daily Sharpe ratio
+SQRT_TRADING_DAYS = 252 ** 0.5
+
+# SignalType -> kernel signal code
+_SIGNAL_CODES = {
+    SignalType.HOLD: SIGNAL_HOLD,
+    SignalType.BUY: SIGNAL_BUY,
+    SignalType.SELL: SIGNAL_SELL,
+    SignalType.CUTLOSS: SIGNAL_CUTLOSS,
+}
 
 
 @dataclass
@@ -40,8 +70,17 @@ class BacktestEngine:
     def __init__(self, initial_capital: float = 100_000_000):
         self.initial_capital = initial_capital
         self.capital = initial_capital
-        self.trades: List[BacktestTrade] = []
-        self.equity_curve = []
+        # Closed trades as parallel columns; BacktestTrade objects are built on demand
+        self._trade_symbol = np.empty(0, dtype=object)
+        self._trade_entry_ts = np.empty(0, dtype='datetime64[ns]')
+        self._trade_exit_ts = np.empty(0, dtype='datetime64[ns]')
+        self._trade_entry_px = np.empty(0, dtype=np.float64)
+        self._trade_exit_px = np.empty(0, dtype=np.float64)
+        self._trade_qty = np.empty(0, dtype=np.int64)
+        self._trade_pnl = np.empty(0, dtype=np.float64)
+        # Equity curve as parallel NumPy columns; the DataFrame is built on demand
+        self.equity_timestamps = np.empty(0, dtype='datetime64[ns]')
+        self.equity_values = np.empty(0, dtype=np.float64)
 
     def run_backtest(
         self,
@@ -62,114 +101,298 @@ class BacktestEngine:
         """
         logger.info(f"Running backtest on {symbol} with {len(data)} data points")
 
-        signal_engine = SignalEngine()
         risk_manager = RiskManager()
         risk_manager.initial_capital = self.initial_capital
         risk_manager.current_capital = self.initial_capital
 
-        current_position = None
-
-        for idx, row in data.iterrows():
-            timestamp = row['timestamp']
-            close = row['close']
-            high = row['high']
-            low = row['low']
-            volume = row['volume']
-
-            # Update signal engine
-            signal_engine.update_price(symbol, close, volume, high, low)
-
-            # Update position price
-            if current_position:
-                current_position.current_price = close
-
-            # Generate signal
-            signal = signal_engine.generate_signal(symbol, close)
-
-            if not signal:
-                continue
-
-            # Execute based on signal
-            if signal.signal_type == SignalType.BUY and not current_position:
-                # Calculate position size
-                stop_loss = close * 0.97
-                quantity = risk_manager.calculate_position_size(symbol, close, stop_loss)
-
-                if quantity > 0:
-                    current_position = BacktestTrade(
-                        symbol=symbol,
-                        entry_time=timestamp,
-                        entry_price=close,
-                        exit_time=None,
-                        exit_price=None,
-                        quantity=quantity,
-                    )
-
-                    # Update capital
-                    self.capital -= quantity * close
-
-            elif signal.signal_type in [SignalType.SELL, SignalType.CUTLOSS] and current_position:
-                # Close position
-                current_position.exit_time = timestamp
-                current_position.exit_price = close
-                current_position.pnl = (close - current_position.entry_price) * current_position.quantity
-                current_position.pnl_percent = (close - current_position.entry_price) / current_position.entry_price
-                current_position.holding_period = timestamp - current_position.entry_time
-
-                # Update capital
-                self.capital += current_position.quantity * close
-
-                self.trades.append(current_position)
-                current_position = None
-
-            # Record equity
-            equity = self.capital
-            if current_position:
-                equity += current_position.quantity * close
-
-            self.equity_curve.append({
-                'timestamp': timestamp,
-                'equity': equity,
-            })
+        # Pull columns out once and index by position
+        timestamps = data['timestamp'].to_numpy(dtype='datetime64[ns]')
+        closes = data['close'].to_numpy(dtype=np.float64)
+
+        # Signals for every bar in one vectorized pass
+        signals = self._precompute_signals(data)
+
+        # Position sizing only for bars that can open a position; iterate Python
+        # floats rather than indexing NumPy scalars one element at a time
+        quantities = np.zeros(len(closes), dtype=np.int64)
+        calc_size = risk_manager.calculate_position_size
+        buy_idx = np.flatnonzero(signals == SIGNAL_BUY)
+        for i, close in zip(buy_idx.tolist(), closes[buy_idx].tolist()):
+            quantities[i] = calc_size(symbol, close, close * STOP_LOSS_RATIO)
+
+        # Accounting pass runs in the compiled kernel
+        entry_idx, exit_idx, trade_qty, n_trades, equity, recorded, capital = backtest_loop(
+            closes, signals, quantities, float(self.capital)
+        )
+        self.capital = capital
+
+        entry_idx = entry_idx[:n_trades]
+        exit_idx = exit_idx[:n_trades]
+        self._append_trades((
+            np.full(n_trades, symbol, dtype=object),
+            timestamps[entry_idx],
+            timestamps[exit_idx],
+            closes[entry_idx],
+            closes[exit_idx],
+            trade_qty[:n_trades],
+        ))
+
+        # Record equity for every bar that produced a signal
+        self._append_equity(timestamps[recorded], equity[recorded])
 
         # Calculate metrics
         results = self.calculate_metrics()
         return results
 
+    def run_portfolio_backtest(
+        self,
+        data_by_symbol: Dict[str, pd.DataFrame],
+        strategy_func: Callable,
+        max_workers: Optional[int] = None,
+    ) -> Dict:
+        """
+        Backtest several symbols in parallel worker processes
+
+        Capital is split evenly across symbols. Each symbol runs in its own
+        BacktestEngine; trades are merged and equity curves are summed on
+        the union of timestamps.
+
+        Args:
+            data_by_symbol: Historical data per symbol (same columns as run_backtest)
+            strategy_func: Module-level (picklable) signal function
+            max_workers: Worker processes (default: min(CPU count, symbols))
+
+        Returns:
+            Portfolio metrics plus per-symbol results and failed symbols
+        """
+        if not data_by_symbol:
+            return {"error": "No symbols to backtest"}
+
+        capital_per_symbol = self.initial_capital / len(data_by_symbol)
+        workers = max_workers or min(os.cpu_count() or 1, len(data_by_symbol))
+        logger.info(f"Running portfolio backtest on {len(data_by_symbol)} symbols with {workers} workers")
+
+        per_symbol = {}
+        failed_symbols = []
+        equity_columns = {}
+        final_capital = 0.0
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    _run_symbol_backtest, data, strategy_func, symbol, capital_per_symbol
+                ): symbol
+                for symbol, data in data_by_symbol.items()
+            }
+
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    results, trade_columns, timestamps, equity, capital = future.result()
+                except Exception as e:
+                    # A failing symbol keeps its capital untouched
+                    logger.error(f"Backtest failed for {symbol}: {e}")
+                    failed_symbols.append(symbol)
+                    final_capital += capital_per_symbol
+                    continue
+
+                per_symbol[symbol] = results
+                self._append_trades(trade_columns)
+                final_capital += capital
+                equity_columns[symbol] = pd.Series(equity, index=pd.Index(timestamps), dtype=np.float64)
+
+        self.capital = final_capital
+
+        if equity_columns:
+            # Carry each symbol's equity forward; before its first bar it holds its allocation
+            equity_frame = pd.concat(equity_columns, axis=1).sort_index().ffill()
+            equity_frame = equity_frame.fillna(capital_per_symbol)
+            unfunded = capital_per_symbol * (len(data_by_symbol) - len(equity_columns))
+            portfolio_equity = equity_frame.sum(axis=1) + unfunded
+            self._append_equity(
+                portfolio_equity.index.to_numpy(dtype='datetime64[ns]'),
+                portfolio_equity.to_numpy(dtype=np.float64),
+            )
+
+        results = self.calculate_metrics()
+        results["per_symbol"] = per_symbol
+        results["failed_symbols"] = failed_symbols
+        return results
+
+    @staticmethod
+    def _precompute_signals(data: pd.DataFrame) -> np.ndarray:
+        """
+        Compute SignalEngine.generate_signal for every bar at once
+
+        Applies the same indicator definitions and strategy rules with
+        rolling window operations over the whole series instead of
+        rebuilding a price history per bar.
+
+        Returns:
+            int8 array of signal codes (SIGNAL_NONE until enough history)
+        """
+        close = data['close'].astype(np.float64).reset_index(drop=True)
+        high = data['high'].astype(np.float64).reset_index(drop=True)
+        low = data['low'].astype(np.float64).reset_index(drop=True)
+        volume = data['volume'].to_numpy(dtype=np.float64)
+        c = close.to_numpy()
+        n = len(c)
+        idx = np.arange(n)
+
+        # Indicators as of each bar
+        sma_20_series = close.rolling(20).mean()
+        sma_20 = sma_20_series.to_numpy()
+        prev_sma_20 = sma_20_series.shift(1).to_numpy()
+        sma_50 = close.rolling(50).mean().to_numpy()
+
+        delta = close.diff()
+        gains = delta.where(delta > 0, 0)
+        losses = -delta.where(delta < 0, 0)
+        rs = gains.rolling(window=14).mean() / losses.rolling(window=14).mean()
+        rsi = (100 - (100 / (1 + rs))).to_numpy()
+
+        volatility = close.pct_change().rolling(window=20).std().to_numpy()
+        resistance = high.rolling(50, min_periods=1).max().to_numpy()
+        support = low.rolling(50, min_periods=1).min().to_numpy()
+
+        # Volume surge compares against the mean of the prior bars still in history
+        cum_volume = np.concatenate(([0.0], np.cumsum(volume)))
+        start = np.maximum(idx - (PRICE_HISTORY_SIZE - 1), 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_volume = (cum_volume[idx] - cum_volume[start]) / (idx - start)
+            price_change = np.concatenate(([np.nan], np.diff(c) / c[:-1]))
+        volume_surge = volume > avg_volume * 2.0
+
+        # Strategy votes
+        buy = np.zeros(n, dtype=np.int8)
+        sell = np.zeros(n, dtype=np.int8)
+
+        if settings.enable_breakout_strategy:
+            buy += (resistance > 0) & (c >= resistance * 0.998)
+
+        if settings.enable_support_resistance_strategy:
+            at_support = (support > 0) & (c <= support * 1.002)
+            buy += at_support
+            sell += (support > 0) & ~at_support & (c <= support * 0.98)
+
+        has_ma = (sma_20 != 0) & ~np.isnan(sma_20) & (sma_50 != 0) & ~np.isnan(sma_50)
+        golden_cross = has_ma & (prev_sma_20 <= sma_50) & (sma_20 > sma_50)
+        death_cross = has_ma & ~golden_cross & (prev_sma_20 >= sma_50) & (sma_20 < sma_50)
+        buy += golden_cross
+        sell += death_cross
+
+        buy += (rsi > 0) & (rsi < 30)
+        sell += rsi > 70
+
+        buy += volume_surge & (price_change > 0.02)
+
+        cutloss = np.zeros(n, dtype=np.bool_)
+        if settings.enable_volatility_cutloss:
+            cutloss = volatility > settings.volatility_threshold
+
+        # Resolve votes the same way generate_signal does
+        signals = np.full(n, SIGNAL_HOLD, dtype=np.int8)
+        signals[buy > sell] = SIGNAL_BUY
+        signals[sell > buy] = SIGNAL_SELL
+        signals[cutloss] = SIGNAL_CUTLOSS
+        signals[idx < MIN_SIGNAL_HISTORY - 1] = SIGNAL_NONE
+
+        return signals
+
+    @property
+    def trades(self) -> List[BacktestTrade]:
+        """Closed trades as BacktestTrade records"""
+        trades = []
+        for symbol, entry_ts, exit_ts, entry_price, exit_price, quantity, pnl in zip(
+            self._trade_symbol, self._trade_entry_ts, self._trade_exit_ts,
+            self._trade_entry_px.tolist(), self._trade_exit_px.tolist(),
+            self._trade_qty.tolist(), self._trade_pnl.tolist(),
+        ):
+            entry_time = pd.Timestamp(entry_ts)
+            exit_time = pd.Timestamp(exit_ts)
+            trades.append(BacktestTrade(
+                symbol=symbol,
+                entry_time=entry_time,
+                entry_price=entry_price,
+                exit_time=exit_time,
+                exit_price=exit_price,
+                quantity=quantity,
+                pnl=pnl,
+                pnl_percent=(exit_price - entry_price) / entry_price,
+                holding_period=exit_time - entry_time,
+            ))
+        return trades
+
+    @property
+    def _trade_columns(self) -> Tuple[np.ndarray, ...]:
+        """Trade columns in the order _append_trades expects"""
+        return (
+            self._trade_symbol, self._trade_entry_ts, self._trade_exit_ts,
+            self._trade_entry_px, self._trade_exit_px, self._trade_qty,
+        )
+
+    def _append_trades(self, columns: Tuple[np.ndarray, ...]):
+        """Append a block of closed trades given as (symbol, entry/exit time, entry/exit price, quantity)"""
+        symbol, entry_ts, exit_ts, entry_px, exit_px, qty = columns
+        self._trade_symbol = np.concatenate((self._trade_symbol, symbol))
+        self._trade_entry_ts = np.concatenate((self._trade_entry_ts, entry_ts))
+        self._trade_exit_ts = np.concatenate((self._trade_exit_ts, exit_ts))
+        self._trade_entry_px = np.concatenate((self._trade_entry_px, entry_px))
+        self._trade_exit_px = np.concatenate((self._trade_exit_px, exit_px))
+        self._trade_qty = np.concatenate((self._trade_qty, qty))
+        self._trade_pnl = np.concatenate((self._trade_pnl, (exit_px - entry_px) * qty))
+
+    def _append_equity(self, timestamps: np.ndarray, values: np.ndarray):
+        """Append a block of equity points to the equity columns"""
+        self.equity_timestamps = np.concatenate((self.equity_timestamps, timestamps))
+        self.equity_values = np.concatenate((self.equity_values, values))
+
+    @property
+    def equity_curve(self) -> pd.DataFrame:
+        """Equity curve as a DataFrame with 'timestamp' and 'equity' columns"""
+        return pd.DataFrame({
+            'timestamp': self.equity_timestamps,
+            'equity': self.equity_values,
+        })
+
     def calculate_metrics(self) -> Dict:
         """Calculate performance metrics"""
-        if not self.trades:
+        pnl = self._trade_pnl
+        if not len(pnl):
             return {"error": "No trades executed"}
 
-        # Basic metrics
-        total_trades = len(self.trades)
-        winning_trades = [t for t in self.trades if t.pnl > 0]
-        losing_trades = [t for t in self.trades if t.pnl < 0]
+        # Basic metrics from the pnl column
+        total_trades = len(pnl)
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl < 0]
 
-        win_rate = len(winning_trades) / total_trades if total_trades > 0 else 0
+        win_rate = len(wins) / total_trades
 
-        total_pnl = sum(t.pnl for t in self.trades)
+        total_pnl = float(pnl.sum())
         total_return = (self.capital - self.initial_capital) / self.initial_capital
 
-        avg_win = sum(t.pnl for t in winning_trades) / len(winning_trades) if winning_trades else 0
-        avg_loss = sum(t.pnl for t in losing_trades) / len(losing_trades) if losing_trades else 0
+        avg_win = float(wins.mean()) if len(wins) else 0
+        avg_loss = float(losses.mean()) if len(losses) else 0
 
         profit_factor = abs(avg_win / avg_loss) if avg_loss != 0 else 0
 
-        # Max drawdown
-        equity_series = pd.DataFrame(self.equity_curve)['equity']
-        cummax = equity_series.cummax()
-        drawdown = (equity_series - cummax) / cummax
-        max_drawdown = drawdown.min()
+        # Max drawdown and Sharpe ratio (simplified) straight from the equity array
+        equity = self.equity_values
+        max_drawdown = 0.0
+        sharpe_ratio = 0
+        if len(equity):
+            cummax = np.maximum.accumulate(equity)
+            max_drawdown = float(((equity - cummax) / cummax).min())
 
-        # Sharpe ratio (simplified)
-        returns = equity_series.pct_change().dropna()
-        sharpe_ratio = (returns.mean() / returns.std()) * (252 ** 0.5) if returns.std() > 0 else 0
+            returns = np.diff(equity) / equity[:-1]
+            returns_std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+            if returns_std > 0:
+                sharpe_ratio = float(returns.mean() / returns_std * SQRT_TRADING_DAYS)
 
         return {
             "total_trades": total_trades,
-            "winning_trades": len(winning_trades),
-            "losing_trades": len(losing_trades),
+            "winning_trades": len(wins),
+            "losing_trades": len(losses),
             "win_rate": win_rate,
             "total_pnl": total_pnl,
             "total_return": total_return,
@@ -180,3 +403,15 @@ class BacktestEngine:
             "sharpe_ratio": sharpe_ratio,
             "final_capital": self.capital,
         }
+
+
+def _run_symbol_backtest(
+    data: pd.DataFrame,
+    strategy_func: Callable,
+    symbol: str,
+    initial_capital: float,
+) -> Tuple[Dict, Tuple[np.ndarray, ...], np.ndarray, np.ndarray, float]:
+    """Worker for run_portfolio_backtest: backtest one symbol in a fresh engine"""
+    engine = BacktestEngine(initial_capital=initial_capital)
+    results = engine.run_backtest(data, strategy_func, symbol)
+    return results, engine._trade_columns, engine.equity_timestamps, engine.equity_values, engine.capital
@@ -0,0 +1,202 @@
+"""
+Numba kernels for SignalEngine indicators
+Each reads the trailing samples of the price history and returns the latest value
+"""
+import numpy as np
+
+from utils.jit import NUMBA_AVAILABLE, njit, prange
+
+
+@njit(cache=True)
+def sma_last(values: np.ndarray, period: int) -> float:
+    """Mean of the last period values"""
+    n = len(values)
+    total = 0.0
+    for i in range(n - period, n):
+        total += values[i]
+    return total / period
+
+
+@njit(cache=True)
+def ema_last(values: np.ndarray, period: int) -> float:
+    """EMA over the whole series, seeded with the first value (pandas adjust=False)"""
+    alpha = 2.0 / (period + 1)
+    ema = values[0]
+    for i in range(1, len(values)):
+        ema += alpha * (values[i] - ema)
+    return ema
+
+
+@njit(cache=True)
+def rsi_last(values: np.ndarray, period: int) -> float:
+    """RSI from the simple average gain/loss over the last period changes"""
+    n = len(values)
+    gain = 0.0
+    loss = 0.0
+    for i in range(n - period, n):
+        delta = values[i] - values[i - 1]
+        if delta > 0:
+            gain += delta
+        else:
+            loss -= delta
+
+    if loss == 0.0:
+        return 100.0 if gain > 0.0 else np.nan
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+@njit(cache=True)
+def _shifted_std(total: float, total_sq: float, count: int) -> float:
+    """
+    Sample standard deviation from one pass of sums of (x - shift) and (x - shift)**2
+    Taking shift from the sample keeps the subtraction below well conditioned
+    """
+    if count < 2:
+        return np.nan
+    return np.sqrt(max(total_sq - total * total / count, 0.0) / (count - 1))
+
+
+@njit(cache=True)
+def bollinger_last(values: np.ndarray, period: int, std_dev: float):
+    """(upper, middle, lower) bands over the last period values, in one pass"""
+    n = len(values)
+    shift = values[n - period]
+    total = 0.0
+    total_sq = 0.0
+    for i in range(n - period, n):
+        d = values[i] - shift
+        total += d
+        total_sq += d * d
+    sma = shift + total / period
+    std = _shifted_std(total, total_sq, period)
+    return sma + std * std_dev, sma, sma - std * std_dev
+
+
+@njit(cache=True)
+def volatility_last(values: np.ndarray, period: int) -> float:
+    """Sample standard deviation of the last period simple returns, in one pass"""
+    n = len(values)
+    shift = values[n - period] / values[n - period - 1] - 1.0
+    total = 0.0
+    total_sq = 0.0
+    for i in range(n - period, n):
+        d = values[i] / values[i - 1] - 1.0 - shift
+        total += d
+        total_sq += d * d
+    return _shifted_std(total, total_sq, period)
+
+
+@njit(cache=True)
+def signal_indicators(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray):
+    """
+    The window indicators generate_signal uses, in one pass over the last 50 bars
+
+    Returns:
+        (sma_20, sma_50, prev_sma_20, volatility_20, support, resistance); needs at
+        least 21 bars, and sma_50 is NaN with fewer than 50
+    """
+    n = len(closes)
+    sum_20 = 0.0
+    sum_50 = 0.0
+    prev_sum_20 = 0.0
+    support = np.inf
+    resistance = -np.inf
+    # Shifted sums of the last 20 returns, for their standard deviation
+    shift = closes[n - 20] / closes[n - 21] - 1.0
+    ret_sum = 0.0
+    ret_sum_sq = 0.0
+    for i in range(max(n - 50, 0), n):
+        close = closes[i]
+        sum_50 += close
+        if i >= n - 20:
+            sum_20 += close
+            d = close / closes[i - 1] - 1.0 - shift
+            ret_sum += d
+            ret_sum_sq += d * d
+        if n - 21 <= i < n - 1:
+            prev_sum_20 += close
+        if highs[i] > resistance:
+            resistance = highs[i]
+        if lows[i] < support:
+            support = lows[i]
+
+    sma_50 = sum_50 / 50 if n >= 50 else np.nan
+    volatility = _shifted_std(ret_sum, ret_sum_sq, 20)
+
+    return sum_20 / 20, sma_50, prev_sum_20 / 20, volatility, support, resistance
+
+
+@njit(cache=True)
+def signal_indicators_batch(
+    closes: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    lengths: np.ndarray,
+) -> np.ndarray:
+    """
+    signal_indicators for many symbols
+
+    Args:
+        closes, highs, lows: (symbols, bars) matrices, right-aligned
+        lengths: Valid trailing bars per row
+
+    Returns:
+        (symbols, 6) matrix of signal_indicators results
+    """
+    n_rows, n_cols = closes.shape
+    out = np.empty((n_rows, 6))
+    for row in range(n_rows):
+        start = n_cols - lengths[row]
+        result = signal_indicators(
+            closes[row, start:], highs[row, start:], lows[row, start:]
+        )
+        for j in range(6):
+            out[row, j] = result[j]
+    return out
+
+
+@njit(cache=True, parallel=True)
+def signal_indicators_batch_parallel(
+    closes: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    lengths: np.ndarray,
+) -> np.ndarray:
+    """signal_indicators_batch with rows spread across threads"""
+    n_rows, n_cols = closes.shape
+    out = np.empty((n_rows, 6))
+    for row in prange(n_rows):
+        start = n_cols - lengths[row]
+        result = signal_indicators(
+            closes[row, start:], highs[row, start:], lows[row, start:]
+        )
+        for j in range(6):
+            out[row, j] = result[j]
+    return out
+
+
+def warm_up():
+    """
+    Compile, or load from the on-disk cache, every kernel for the argument types
+    SignalEngine passes, so the first price update doesn't pay for it
+    """
+    if not NUMBA_AVAILABLE:
+        return
+
+    closes = np.linspace(100.0, 110.0, 60)
+    highs = closes * 1.01
+    lows = closes * 0.99
+    sma_last(closes, 20)
+    ema_last(closes, 12)
+    rsi_last(closes, 14)
+    bollinger_last(closes, 20, 2.0)
+    volatility_last(closes, 20)
+    signal_indicators(closes, highs, lows)
+    batch = (
+        np.vstack((closes, closes)),
+        np.vstack((highs, highs)),
+        np.vstack((lows, lows)),
+        np.array([60, 40], dtype=np.int64),
+    )
+    signal_indicators_batch(*batch)
+    signal_indicators_batch_parallel(*batch)
@@ -2,17 +2,34 @@
 DNSE Lightspeed API Client
 Official integration with DNSE trading API
 """
+import asyncio
 import time
 import hmac
 import hashlib
-import requests
+import httpx
 import json
 import base64
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 from utils.config import settings
 from utils.cache import cache_manager, CacheKeys, cached
+from utils.http import HTTP2_AVAILABLE
+
+# Seconds before a DNSE API call is abandoned
+REQUEST_TIMEOUT = 5.0
+
+# GET responses kept for conditional requests; order status and history GETs
+# are keyed by order ID or date range, so only the most recent are kept
+ETAG_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=4096)
+def _market_key(kind: str, name: str) -> str:
+    """Cache key for a per-symbol market data call, formatted once per symbol"""
+    return f"dnse:{kind}:{name}"
 
 
 class DNSEAPIClient:
@@ -43,7 +60,28 @@ class DNSEAPIClient:
         self.token_expires_at = None
         self.user_info = {}
 
-        self.session = requests.Session()
+        # Prebuilt Authorization header and monotonic expiry for the _request fast path
+        self._bearer_header: Optional[str] = None
+        self._token_valid_until_mono = 0.0
+        self._jwt_payload: Dict = {}
+
+        # Secret encoded once for the one-shot hmac.digest signing path
+        self._api_secret_bytes = self.api_secret.encode()
+
+        # Pooled keep-alive client; HTTP/2 multiplexes bursts of market and order calls.
+        # Transport retries cover connection failures only, so orders are never resent
+        self.session = httpx.Client(
+            transport=httpx.HTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+                retries=2,
+            ),
+            timeout=REQUEST_TIMEOUT,
+        )
+
+        # Last ETag and body per GET (endpoint, params) for conditional requests,
+        # least recently used first
+        self._etag_cache: "OrderedDict[Tuple, Tuple[str, Dict]]" = OrderedDict()
 
         # Auto login if username/password provided
         if self.username and self.password:
@@ -88,14 +126,13 @@ class DNSEAPIClient:
             result = response.json()
 
             if "token" in result:
-                self.token = result["token"]
                 self.user_info = {
                     "roles": result.get("roles", []),
                     "isNeedReset": result.get("isNeedReset", False)
                 }
 
-                # Decode JWT to get expiry time
-                self._parse_token_expiry()
+                # Store token and decode JWT to get expiry time
+                self._set_token(result["token"])
 
                 # Cache token
                 cache_manager.set(
@@ -114,14 +151,24 @@ class DNSEAPIClient:
                 logger.error(f"Login failed: {result}")
                 return {"success": False, "error": "No token in response", **result}
 
-        except requests.exceptions.RequestException as e:
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError: a body that is not JSON (e.g. a gateway error page)
             logger.error(f"Login request failed: {e}")
             if hasattr(e, 'response') and e.response is not None:
                 logger.error(f"Response: {e.response.text}")
             return {"success": False, "error": str(e)}
 
+    def _set_token(self, token: str):
+        """Store a new token and derive its header and expiry"""
+        self.token = token
+        self.token_expires_at = None
+        self._token_valid_until_mono = 0.0
+        self._jwt_payload = {}
+        self._bearer_header = f"Bearer {token}"
+        self._parse_token_expiry()
+
     def _parse_token_expiry(self):
-        """Parse JWT token to get expiry time"""
+        """Decode the JWT payload once and derive expiry time and account"""
         if not self.token:
             return
 
@@ -138,11 +185,13 @@ class DNSEAPIClient:
                 payload_b64 += '=' * padding
 
             payload = json.loads(base64.b64decode(payload_b64))
+            self._jwt_payload = payload
 
             # Get expiry timestamp
             exp = payload.get('exp')
             if exp:
                 self.token_expires_at = datetime.fromtimestamp(exp)
+                self._token_valid_until_mono = time.monotonic() + (exp - time.time())
                 logger.debug(f"Token expires at: {self.token_expires_at}")
 
             # Store useful info from token
@@ -152,32 +201,15 @@ class DNSEAPIClient:
             logger.warning(f"Failed to parse token expiry: {e}")
 
     def _get_token_field(self, field: str) -> Optional[str]:
-        """Get a field from JWT token payload"""
-        if not self.token:
-            return None
-
-        try:
-            parts = self.token.split('.')
-            if len(parts) != 3:
-                return None
-
-            payload_b64 = parts[1]
-            padding = 4 - len(payload_b64) % 4
-            if padding != 4:
-                payload_b64 += '=' * padding
-
-            payload = json.loads(base64.b64decode(payload_b64))
-            return payload.get(field)
-
-        except Exception:
-            return None
+        """Get a field from the decoded JWT token payload"""
+        return self._jwt_payload.get(field)
 
     def _is_token_valid(self) -> bool:
         """Check if current token is still valid"""
         if not self.token:
             return False
 
-        if not self.token_expires_at:
+        if not self.token_expires_at and not self._jwt_payload:
             self._parse_token_expiry()
 
         if not self.token_expires_at:
@@ -188,12 +220,16 @@ class DNSEAPIClient:
 
     def _ensure_token(self) -> bool:
         """Ensure we have a valid token, refresh if needed"""
+        # Fast path: token known to be valid for more than 5 minutes
+        if self.token and time.monotonic() < self._token_valid_until_mono - 300:
+            return True
+
         # Try to get cached token first
-        cached_token = cache_manager.get("dnse:auth_token")
-        if cached_token and not self.token:
-            self.token = cached_token
-            self._parse_token_expiry()
-            logger.info("Using cached token")
+        if not self.token:
+            cached_token = cache_manager.get("dnse:auth_token")
+            if cached_token:
+                self._set_token(cached_token)
+                logger.info("Using cached token")
 
         # Check if token is valid
         if self._is_token_valid():
@@ -206,37 +242,42 @@ class DNSEAPIClient:
 
     def _generate_signature(self, method: str, path: str, timestamp: str, body: str = "") -> str:
         """Generate HMAC-SHA256 signature for authentication"""
-        message = f"{timestamp}{method}{path}{body}"
-        signature = hmac.new(
-            self.api_secret.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
-        return signature
-
-    def _request(self, method: str, endpoint: str, data: Optional[Dict] = None, use_token: bool = True) -> Dict:
+        message = b"%b%b%b%b" % (
+            timestamp.encode("ascii"),
+            method.encode("ascii"),
+            path.encode("ascii"),
+            body.encode() if body else b"",
+        )
+        return hmac.digest(self._api_secret_bytes, message, hashlib.sha256).hex()
+
+    def _build_request(
+        self, method: str, endpoint: str, data: Optional[Dict], use_token: bool
+    ) -> Tuple[Dict, str, Optional[Tuple]]:
         """
-        Make authenticated request to DNSE API
+        Prepare authenticated headers and body for a DNSE API call
 
-        Args:
-            method: HTTP method (GET, POST, DELETE)
-            endpoint: API endpoint path
-            data: Request data
-            use_token: Use token auth (True) or HMAC auth (False)
+        Returns:
+            (headers, body, etag_key) where etag_key is set for GET requests
         """
-        url = f"{self.base_url}{endpoint}"
+        if method not in ("GET", "POST", "PUT", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
 
         headers = {
             "Content-Type": "application/json",
         }
 
+        # Serialize once so the HMAC signs exactly the bytes that are sent
+        body = ""
+        if data is not None and method in ("POST", "PUT"):
+            body = json.dumps(data)
+
         # Choose authentication method
         if use_token and (self.token or (self.username and self.password)):
             # Token-based authentication (preferred)
             self._ensure_token()
 
             if self.token:
-                headers["Authorization"] = f"Bearer {self.token}"
+                headers["Authorization"] = self._bearer_header
             else:
                 logger.warning("Token auth requested but no token available, falling back to HMAC")
                 use_token = False
@@ -245,10 +286,6 @@ class DNSEAPIClient:
             # HMAC-based authentication (fallback)
             timestamp = str(int(time.time() * 1000))
 
-            body = ""
-            if data and method in ["POST", "PUT"]:
-                body = json.dumps(data)
-
             signature = self._generate_signature(method, endpoint, timestamp, body)
 
             headers.update({
@@ -257,41 +294,89 @@ class DNSEAPIClient:
                 "X-TIMESTAMP": timestamp,
             })
 
-        try:
-            if method == "GET":
-                response = self.session.get(url, headers=headers, params=data)
-            elif method == "POST":
-                response = self.session.post(url, headers=headers, json=data)
-            elif method == "PUT":
-                response = self.session.put(url, headers=headers, json=data)
-            elif method == "DELETE":
-                response = self.session.delete(url, headers=headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+        etag_key = None
+        if method == "GET":
+            etag_key = (endpoint, tuple(sorted(data.items())) if data else None)
+            etag_entry = self._etag_cache.get(etag_key)
+            if etag_entry:
+                headers["If-None-Match"] = etag_entry[0]
+
+        return headers, body, etag_key
+
+    def _handle_response(self, response: httpx.Response, etag_key: Optional[Tuple]) -> Dict:
+        """Decode a DNSE API response, serving 304s from the ETag cache"""
+        # Unchanged upstream: reuse the cached body without re-parsing
+        if response.status_code == 304:
+            etag_entry = self._etag_cache.get(etag_key)
+            if etag_entry:
+                self._remember_etag(etag_key, etag_entry)
+                return etag_entry[1]
+
+        response.raise_for_status()
+        result = response.json()
+
+        etag = response.headers.get("ETag")
+        if etag_key and etag:
+            self._remember_etag(etag_key, (etag, result))
+
+        return result
+
+    def _remember_etag(self, etag_key: Tuple, entry: Tuple[str, Dict]):
+        """Store an ETag entry as most recently used, evicting the least recently used"""
+        cache = self._etag_cache
+        cache[etag_key] = entry
+        cache.move_to_end(etag_key)
+        if len(cache) > ETAG_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _request_failed(method: str, endpoint: str, e: Exception) -> Dict:
+        """Log a failed DNSE API call and build the error result"""
+        logger.error(f"DNSE API request failed: {method} {endpoint}")
+        logger.error(f"Error: {e}")
+        if hasattr(e, 'response') and e.response is not None:
+            logger.error(f"Status code: {e.response.status_code}")
+            logger.error(f"Response: {e.response.text}")
+        return {"success": False, "error": str(e)}
 
-            response.raise_for_status()
-            return response.json()
+    def _request(self, method: str, endpoint: str, data: Optional[Dict] = None, use_token: bool = True) -> Dict:
+        """
+        Make authenticated request to DNSE API
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"DNSE API request failed: {method} {endpoint}")
-            logger.error(f"Error: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(f"Status code: {e.response.status_code}")
-                logger.error(f"Response: {e.response.text}")
-            return {"success": False, "error": str(e)}
+        Args:
+            method: HTTP method (GET, POST, DELETE)
+            endpoint: API endpoint path
+            data: Request data
+            use_token: Use token auth (True) or HMAC auth (False)
+        """
+        headers, body, etag_key = self._build_request(method, endpoint, data, use_token)
+
+        try:
+            response = self.session.request(
+                method,
+                f"{self.base_url}{endpoint}",
+                headers=headers,
+                params=data if method == "GET" else None,
+                content=body or None,
+            )
+            return self._handle_response(response, etag_key)
+
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError: a body that is not JSON (e.g. a gateway error page)
+            return self._request_failed(method, endpoint, e)
 
     # Market Data APIs
-    @cached(ttl=5, key_prefix="dnse")
+    @cached(ttl=5, key_fn=lambda self, symbol: _market_key("px", symbol))
     def get_stock_price(self, symbol: str) -> Dict:
         """Get current stock price"""
         return self._request("GET", f"/v1/market/stock/{symbol}")
 
-    @cached(ttl=10, key_prefix="dnse")
+    @cached(ttl=10, key_fn=lambda self, symbol: _market_key("ob", symbol))
     def get_orderbook(self, symbol: str) -> Dict:
         """Get orderbook (bid/ask)"""
         return self._request("GET", f"/v1/market/orderbook/{symbol}")
 
-    @cached(ttl=60, key_prefix="dnse")
+    @cached(ttl=60, key_fn=lambda self, symbol: _market_key("info", symbol))
     def get_stock_info(self, symbol: str) -> Dict:
         """Get stock information"""
         return self._request("GET", f"/v1/market/info/{symbol}")
@@ -300,7 +385,7 @@ class DNSEAPIClient:
         """Get market trading status"""
         return self._request("GET", "/v1/market/status")
 
-    @cached(ttl=30, key_prefix="dnse")
+    @cached(ttl=30, key_fn=lambda self, index="VNINDEX": _market_key("index", index))
     def get_market_index(self, index: str = "VNINDEX") -> Dict:
         """Get market index (VNINDEX, VN30, HNX)"""
         return self._request("GET", f"/v1/market/index/{index}")
@@ -417,5 +502,71 @@ class DNSEAPIClient:
         return self._request("POST", "/v1/accounts/transfer", data)
 
 
-# Global instance
-dnse_client = DNSEAPIClient()
+class AsyncDNSEAPIClient:
+    """
+    Async companion to DNSEAPIClient for concurrent market data polling
+
+    Shares token, signing and ETag state with a sync client, so a watchlist
+    refresh costs roughly one round trip instead of one per symbol.
+    """
+
+    def __init__(self, client: Optional[DNSEAPIClient] = None):
+        self.client = client or get_client()
+        self.session = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+            timeout=REQUEST_TIMEOUT,
+        )
+
+    async def _arequest(self, method: str, endpoint: str, data: Optional[Dict] = None, use_token: bool = True) -> Dict:
+        """Async version of DNSEAPIClient._request"""
+        client = self.client
+        headers, body, etag_key = client._build_request(method, endpoint, data, use_token)
+
+        try:
+            response = await self.session.request(
+                method,
+                f"{client.base_url}{endpoint}",
+                headers=headers,
+                params=data if method == "GET" else None,
+                content=body or None,
+            )
+            return client._handle_response(response, etag_key)
+
+        except (httpx.HTTPError, ValueError) as e:
+            return client._request_failed(method, endpoint, e)
+
+    async def get_stock_price(self, symbol: str) -> Dict:
+        """Get current stock price"""
+        return await self._arequest("GET", f"/v1/market/stock/{symbol}")
+
+    async def get_orderbook(self, symbol: str) -> Dict:
+        """Get orderbook (bid/ask)"""
+        return await self._arequest("GET", f"/v1/market/orderbook/{symbol}")
+
+    async def get_prices(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get current prices for many symbols concurrently"""
+        results = await asyncio.gather(*(self.get_stock_price(s) for s in symbols))
+        return dict(zip(symbols, results))
+
+    async def get_orderbooks(self, symbols: List[str]) -> Dict[str, Dict]:
+        """Get orderbooks for many symbols concurrently"""
+        results = await asyncio.gather(*(self.get_orderbook(s) for s in symbols))
+        return dict(zip(symbols, results))
+
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.session.aclose()
+
+
+@lru_cache(maxsize=1)
+def get_client() -> DNSEAPIClient:
+    """Shared DNSEAPIClient, created (and logged in) on first use rather than at import"""
+    return DNSEAPIClient()
+
+
+def __getattr__(name: str):
+    # Keep `from core.dnse_api_client import dnse_client` working without an import-time login
+    if name == "dnse_client":
+        return get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,16 +2,42 @@
 Order Executor Module
 Handles order placement via DNSE REST API
 """
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from enum import Enum
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from threading import Lock
+import asyncio
+import itertools
+import sqlite3
 import time
 import hmac
 import hashlib
-import json
+import httpx
+import numpy as np
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from loguru import logger
 from utils.config import settings
+from utils.http import HTTP2_AVAILABLE
+
+# Seconds before an async batch request is abandoned
+BATCH_TIMEOUT = 30.0
+
+# Seconds a positions/balance response is reused within a decision cycle
+ACCOUNT_CACHE_TTL = 0.5
+
+# Orders kept in memory as live objects; the rest are read back from SQLite
+ORDER_CACHE_SIZE = 1024
+
+# Order signing relies on OpenSSL's SHA-256, which dispatches to SHA-NI / ARMv8
+# crypto instructions where the CPU has them
+if hashlib.sha256.__module__ != "_hashlib":
+    logger.warning("hashlib is not OpenSSL-backed; order signing falls back to builtin SHA-256")
 
 
 class OrderSide(Enum):
@@ -44,6 +70,11 @@ class OrderStatus(Enum):
 class Order:
     """Order model"""
 
+    __slots__ = (
+        "symbol", "side", "quantity", "price", "order_type", "order_id", "status",
+        "filled_quantity", "avg_filled_price", "created_at_ns", "updated_at_ns", "error_message",
+    )
+
     def __init__(
         self,
         symbol: str,
@@ -62,19 +93,53 @@ class Order:
         self.status = OrderStatus.PENDING
         self.filled_quantity = 0
         self.avg_filled_price = 0.0
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        # Epoch nanoseconds; datetimes are only built when read
+        self.created_at_ns = time.time_ns()
+        self.updated_at_ns = self.created_at_ns
         self.error_message = None
 
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
+
+    @property
+    def updated_at(self) -> datetime:
+        return datetime.fromtimestamp(self.updated_at_ns / 1e9)
+
+    def touch(self):
+        """Mark the order as updated now"""
+        self.updated_at_ns = time.time_ns()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Order":
+        """Rebuild an order from to_dict() output"""
+        order = cls(
+            symbol=data["symbol"],
+            side=OrderSide(data["side"]),
+            quantity=data["quantity"],
+            price=data["price"],
+            order_type=OrderType(data["order_type"]),
+            order_id=data["order_id"],
+        )
+        order.status = OrderStatus(data["status"])
+        order.filled_quantity = data["filled_quantity"]
+        order.avg_filled_price = data["avg_filled_price"]
+        order.created_at_ns = _isoformat_to_ns(data["created_at"])
+        order.updated_at_ns = _isoformat_to_ns(data["updated_at"])
+        order.error_message = data["error_message"]
+        return order
+
     def to_dict(self) -> Dict:
+        # _value_ is the member's stored value; .value reaches it through a descriptor
+        # call, which adds up since every order store write serializes this dict
         return {
             "order_id": self.order_id,
             "symbol": self.symbol,
-            "side": self.side.value,
+            "side": self.side._value_,
             "quantity": self.quantity,
             "price": self.price,
-            "order_type": self.order_type.value,
-            "status": self.status.value,
+            "order_type": self.order_type._value_,
+            "status": self.status._value_,
             "filled_quantity": self.filled_quantity,
             "avg_filled_price": self.avg_filled_price,
             "created_at": self.created_at.isoformat(),
@@ -83,7 +148,119 @@ class Order:
         }
 
     def __repr__(self):
-        return f"Order({self.symbol}, {self.side.value}, {self.quantity}@{self.price}, {self.status.value})"
+        return f"Order({self.symbol}, {self.side._value_}, {self.quantity}@{self.price}, {self.status._value_})"
+
+
+def _isoformat_to_ns(value: str) -> int:
+    """Epoch nanoseconds from an isoformat() timestamp (microsecond precision)"""
+    return round(datetime.fromisoformat(value).timestamp() * 1_000_000) * 1000
+
+
+class OrderStore:
+    """
+    Orders keyed by order_id, persisted to SQLite
+    Every write goes to the database; only the most recently used orders are
+    kept in memory, so a long session does not pin every order it placed
+    """
+
+    def __init__(self, path: str, cache_size: int = ORDER_CACHE_SIZE):
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Order]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use"""
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS orders ("
+                "order_id TEXT PRIMARY KEY, symbol TEXT, json BLOB, "
+                "created_ns INTEGER, updated_ns INTEGER)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS orders_symbol ON orders (symbol)")
+            self._db = db
+        return self._db
+
+    def _remember(self, order: Order):
+        """Mark an order recently used, evicting the least recently used one"""
+        self._cache[order.order_id] = order
+        self._cache.move_to_end(order.order_id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _row(order: Order) -> Tuple:
+        """Table row for an order"""
+        return (
+            order.order_id,
+            order.symbol,
+            orjson.dumps(order.to_dict()),
+            order.created_at_ns,
+            order.updated_at_ns,
+        )
+
+    def put(self, order: Order):
+        """Insert or update an order"""
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?)", self._row(order)
+            )
+            self._remember(order)
+
+    def put_many(self, orders: List[Order]):
+        """Insert or update several orders in one transaction"""
+        with self._lock:
+            db = self._connect()
+            db.execute("BEGIN")
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?)",
+                    map(self._row, orders),
+                )
+            for order in orders[-self.cache_size:]:
+                self._remember(order)
+
+    def get(self, order_id: str) -> Optional[Order]:
+        """Look up an order, loading it from the database if not in memory"""
+        with self._lock:
+            order = self._cache.get(order_id)
+            if order is None:
+                row = self._connect().execute(
+                    "SELECT json FROM orders WHERE order_id = ?", (order_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                order = Order.from_dict(orjson.loads(row[0]))
+            self._remember(order)
+            return order
+
+    def values(self, symbol: Optional[str] = None, since_ns: int = 0) -> List[Order]:
+        """
+        Stored orders, oldest first, optionally for one symbol and/or created
+        at or after since_ns (epoch nanoseconds)
+        """
+        with self._lock:
+            if symbol:
+                rows = self._connect().execute(
+                    "SELECT order_id, json FROM orders WHERE symbol = ? AND created_ns >= ? "
+                    "ORDER BY created_ns",
+                    (symbol.upper(), since_ns),
+                )
+            else:
+                rows = self._connect().execute(
+                    "SELECT order_id, json FROM orders WHERE created_ns >= ? ORDER BY created_ns",
+                    (since_ns,),
+                )
+            # Prefer the live object so callers see the same instance as get()
+            return [
+                self._cache.get(order_id) or Order.from_dict(orjson.loads(data))
+                for order_id, data in rows
+            ]
 
 
 class OrderExecutor:
@@ -102,25 +279,90 @@ class OrderExecutor:
         self.api_key = settings.dnse_api_key
         self.api_secret = settings.dnse_api_secret
         self.account_id = settings.dnse_account_id
+        # HMAC keyed once; each signature copies this instead of re-deriving the key pads.
+        # Naming the digest resolves it through OpenSSL's EVP, so this is OpenSSL's HMAC
+        # context and copy() clones the precomputed ipad/opad state in C
+        self._hmac_template = hmac.new(self.api_secret.encode(), digestmod="sha256")
         self.session = requests.Session()
-        self.orders: Dict[str, Order] = {}
+        self.session.headers.update({"Content-Type": "application/json"})
+        # Wider pool for concurrent order threads; gateway errors are retried only for
+        # idempotent GET/DELETE, since a retried POST could place an order twice
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.1,
+                status_forcelist=[502, 503, 504],
+                allowed_methods={"GET", "DELETE"},
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Paper orders live only as long as the session, like paper cash and
+        # positions, so they never mix with the persisted live order history
+        self.paper_mode = settings.trading_mode == "paper"
+        self.orders = OrderStore(":memory:" if self.paper_mode else settings.orders_db_path)
+        # Order bodies per (side, order type) with account and enum values pre-serialized;
+        # only symbol, quantity and price are spliced in per order
+        account = orjson.dumps(self.account_id)
+        self._order_templates: Dict[Tuple[OrderSide, OrderType], bytes] = {
+            (side, order_type): (
+                b'{"accountId":%b,"symbol":%%b,"side":"%b","quantity":%%d,"orderType":"%b"%b}'
+                % (
+                    account,
+                    side.value.encode(),
+                    order_type.value.encode(),
+                    b',"price":%a' if order_type is OrderType.LIMIT else b"",
+                )
+            )
+            for side in OrderSide
+            for order_type in OrderType
+        }
+
+        # In-flight cancel/status calls per (kind, order_id); concurrent callers share one
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._inflight_lock = Lock()
+
+        # endpoint -> (monotonic fetch time, response) for idempotent account GETs
+        self._account_cache: Dict[str, Tuple[float, Dict]] = {}
 
         # Paper trading
-        self.paper_mode = settings.trading_mode == "paper"
         self.paper_positions: Dict[str, int] = {}  # symbol -> quantity
         self.paper_cash = 1_000_000_000  # 1 billion VND for paper trading
+        # Paper order ids: session start plus a counter, unique even within one millisecond
+        self._paper_id_prefix = f"PAPER_{int(time.time() * 1000)}_"
+        self._paper_seq = itertools.count(1)
 
-    def _generate_signature(self, method: str, endpoint: str, body: str = "") -> str:
+    def _generate_signature(self, method: str, endpoint: str, body: bytes = b"") -> str:
         """Generate HMAC signature for API authentication"""
         timestamp = str(int(time.time() * 1000))
-        message = f"{timestamp}{method}{endpoint}{body}"
-        signature = hmac.new(
-            self.api_secret.encode(), message.encode(), hashlib.sha256
-        ).hexdigest()
-        return signature, timestamp
+        # Feed the parts straight into the HMAC; the body is never concatenated or copied
+        h = self._hmac_template.copy()
+        h.update(timestamp.encode())
+        h.update(method.encode())
+        h.update(endpoint.encode())
+        h.update(body)
+        return h.hexdigest(), timestamp
+
+    @staticmethod
+    def _encode_body(data: Union[Dict, bytes, None]) -> bytes:
+        """JSON request body; pre-serialized bytes pass through untouched"""
+        if isinstance(data, bytes):
+            return data
+        return orjson.dumps(data) if data else b""
+
+    def _signed_headers(self, method: str, endpoint: str, body: bytes) -> Dict[str, str]:
+        """Build HMAC-authenticated headers for a request body"""
+        signature, timestamp = self._generate_signature(method, endpoint, body)
+        return {
+            "X-API-KEY": self.api_key,
+            "X-SIGNATURE": signature,
+            "X-TIMESTAMP": timestamp,
+        }
 
     def _make_request(
-        self, method: str, endpoint: str, data: Dict = None
+        self, method: str, endpoint: str, data: Union[Dict, bytes] = None
     ) -> Optional[Dict]:
         """Make authenticated request to DNSE API"""
         if self.paper_mode:
@@ -129,20 +371,14 @@ class OrderExecutor:
 
         try:
             url = f"{self.base_url}{endpoint}"
-            body = json.dumps(data) if data else ""
-            signature, timestamp = self._generate_signature(method, endpoint, body)
-
-            headers = {
-                "X-API-KEY": self.api_key,
-                "X-SIGNATURE": signature,
-                "X-TIMESTAMP": timestamp,
-                "Content-Type": "application/json",
-            }
+            body = self._encode_body(data)
+            headers = self._signed_headers(method, endpoint, body)
 
             if method == "GET":
                 response = self.session.get(url, headers=headers)
             elif method == "POST":
-                response = self.session.post(url, headers=headers, json=data)
+                # Send the exact bytes that were signed
+                response = self.session.post(url, headers=headers, data=body)
             elif method == "DELETE":
                 response = self.session.delete(url, headers=headers)
             else:
@@ -155,6 +391,58 @@ class OrderExecutor:
             logger.error(f"API request failed: {e}")
             return None
 
+    def _single_flight(self, key: Tuple[str, str], func: Callable[[], Any]) -> Any:
+        """Run func once for concurrent callers with the same key and share its result"""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _cached_get(self, endpoint: str, ttl: float = ACCOUNT_CACHE_TTL) -> Optional[Dict]:
+        """GET an account endpoint, reusing a response younger than ttl seconds"""
+        now = time.monotonic()
+        hit = self._account_cache.get(endpoint)
+        if hit and now - hit[0] < ttl:
+            return hit[1]
+
+        response = self._make_request("GET", endpoint)
+        if response is not None:
+            self._account_cache[endpoint] = (now, response)
+        return response
+
+    async def _arequest(
+        self, client: httpx.AsyncClient, method: str, endpoint: str, data: Union[Dict, bytes] = None
+    ) -> Optional[Dict]:
+        """Async version of _make_request on a shared AsyncClient"""
+        try:
+            body = self._encode_body(data)
+            headers = self._signed_headers(method, endpoint, body)
+
+            response = await client.request(method, endpoint, headers=headers, content=body or None)
+            response.raise_for_status()
+            return response.json()
+
+        except (httpx.HTTPError, ValueError) as e:
+            # ValueError: a body that is not JSON (e.g. a gateway error page)
+            logger.error(f"API request failed: {e}")
+            return None
+
     def place_order(
         self,
         symbol: str,
@@ -167,6 +455,9 @@ class OrderExecutor:
         Place an order
         Returns Order object if successful, None otherwise
         """
+        if self.paper_mode:
+            return self._paper_place_order(symbol, side, quantity, price, order_type)
+
         order = Order(
             symbol=symbol,
             side=side,
@@ -177,57 +468,170 @@ class OrderExecutor:
 
         logger.info(f"Placing order: {order}")
 
-        if self.paper_mode:
-            # Paper trading simulation
-            order.order_id = f"PAPER_{int(time.time()*1000)}"
+        # Real trading
+        response = self._make_request("POST", "/v1/orders", self._order_payload(order))
+        return self._handle_place_response(order, response)
+
+    def _paper_place_order(
+        self,
+        symbol: str,
+        side: OrderSide,
+        quantity: int,
+        price: float,
+        order_type: OrderType,
+    ) -> Order:
+        """Fill an order immediately against the paper account"""
+        order = Order(
+            symbol=symbol,
+            side=side,
+            quantity=quantity,
+            price=price,
+            order_type=order_type,
+        )
+        order.order_id = f"{self._paper_id_prefix}{next(self._paper_seq)}"
+        order.status = OrderStatus.FILLED
+        order.filled_quantity = quantity
+        order.avg_filled_price = price
+
+        # Signed quantity: buys add to the position and spend cash, sells the reverse
+        delta = quantity if side is OrderSide.BUY else -quantity
+        self.paper_cash -= delta * price
+        positions = self.paper_positions
+        positions[symbol] = positions.get(symbol, 0) + delta
+
+        self.orders.put(order)
+        # Backtests place orders in tight loops; only format when DEBUG is enabled
+        logger.opt(lazy=True).debug(
+            "[PAPER MODE] Order filled: {} {}, Cash: {}",
+            lambda: order.order_id,
+            lambda: order,
+            lambda: f"{self.paper_cash:,.0f}",
+        )
+        return order
+
+    def place_orders_batch(
+        self,
+        symbols: np.ndarray,
+        sides: np.ndarray,
+        quantities: np.ndarray,
+        prices: np.ndarray,
+    ) -> List[Optional[Order]]:
+        """
+        Place many limit orders given as parallel arrays
+
+        In paper mode cash and positions are settled with a few NumPy reductions
+        instead of one update per order; in live mode the orders are sent
+        concurrently via place_orders()
+
+        Args:
+            symbols: Symbol per order
+            sides: OrderSide per order
+            quantities: Quantity per order
+            prices: Limit price per order
+
+        Returns:
+            Order (or None if rejected) per input, in the same order
+        """
+        if not self.paper_mode:
+            return self.place_orders(list(zip(symbols, sides, quantities, prices)))
+
+        symbols = np.asarray(symbols)
+        quantities = np.asarray(quantities, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        buys = np.asarray(sides, dtype=object) == OrderSide.BUY
+        deltas = np.where(buys, quantities, -quantities)
+
+        self.paper_cash -= float(deltas @ prices)
+
+        # Net position change per distinct symbol
+        unique_symbols, inverse = np.unique(symbols, return_inverse=True)
+        net = np.zeros(len(unique_symbols), dtype=np.int64)
+        np.add.at(net, inverse, deltas)
+        positions = self.paper_positions
+        for symbol, delta in zip(unique_symbols.tolist(), net.tolist()):
+            positions[symbol] = positions.get(symbol, 0) + delta
+
+        orders = []
+        rows = zip(symbols.tolist(), sides, quantities.tolist(), prices.tolist())
+        for symbol, side, quantity, price in rows:
+            order = Order(symbol=symbol, side=side, quantity=quantity, price=price)
+            order.order_id = f"{self._paper_id_prefix}{next(self._paper_seq)}"
             order.status = OrderStatus.FILLED
             order.filled_quantity = quantity
             order.avg_filled_price = price
+            orders.append(order)
+        self.orders.put_many(orders)
 
-            # Update paper positions
-            if side == OrderSide.BUY:
-                self.paper_cash -= quantity * price
-                self.paper_positions[symbol] = (
-                    self.paper_positions.get(symbol, 0) + quantity
-                )
-            else:  # SELL
-                self.paper_cash += quantity * price
-                self.paper_positions[symbol] = (
-                    self.paper_positions.get(symbol, 0) - quantity
-                )
-
-            self.orders[order.order_id] = order
-            logger.info(
-                f"[PAPER MODE] Order placed: {order.order_id}, Cash: {self.paper_cash:,.0f}"
-            )
-            return order
-
-        # Real trading
-        data = {
-            "accountId": self.account_id,
-            "symbol": symbol.upper(),
-            "side": side.value,
-            "quantity": quantity,
-            "orderType": order_type.value,
-        }
+        logger.info(f"[PAPER MODE] {len(orders)} orders filled, Cash: {self.paper_cash:,.0f}")
+        return orders
 
-        if order_type == OrderType.LIMIT:
-            data["price"] = price
+    def _order_payload(self, order: Order) -> bytes:
+        """Serialized request body for placing an order"""
+        template = self._order_templates[(order.side, order.order_type)]
+        symbol = orjson.dumps(order.symbol)
 
-        response = self._make_request("POST", "/v1/orders", data)
+        if order.order_type is OrderType.LIMIT:
+            # %a is repr(); coerce NumPy scalars so they format as plain numbers
+            price = order.price if type(order.price) is int else float(order.price)
+            return template % (symbol, order.quantity, price)
+        return template % (symbol, order.quantity)
 
+    def _handle_place_response(self, order: Order, response: Optional[Dict]) -> Optional[Order]:
+        """Record a placed order from the API response"""
         if response and response.get("success"):
+            # Positions and balance change once the order is accepted
+            self._account_cache.clear()
             order.order_id = response.get("orderId")
             order.status = OrderStatus.PENDING
-            self.orders[order.order_id] = order
+            self.orders.put(order)
             logger.info(f"Order placed successfully: {order.order_id}")
             return order
         else:
             order.status = OrderStatus.REJECTED
-            order.error_message = response.get("message", "Unknown error")
+            # No response at all when the request itself failed
+            order.error_message = (response or {}).get("message", "Unknown error")
             logger.error(f"Order placement failed: {order.error_message}")
             return None
 
+    async def place_orders_async(self, orders: List[Tuple]) -> List[Optional[Order]]:
+        """
+        Place several orders concurrently
+
+        Args:
+            orders: Tuples of place_order arguments
+                (symbol, side, quantity[, price[, order_type]])
+
+        Returns:
+            Order (or None if rejected) per input, in the same order
+        """
+        if self.paper_mode:
+            return [self.place_order(*spec) for spec in orders]
+
+        pending = [Order(*spec) for spec in orders]
+        for order in pending:
+            logger.info(f"Placing order: {order}")
+
+        # One multiplexed connection pool for the whole batch
+        async with httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Content-Type": "application/json"},
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=BATCH_TIMEOUT,
+        ) as client:
+            responses = await asyncio.gather(
+                *(self._arequest(client, "POST", "/v1/orders", self._order_payload(order)) for order in pending)
+            )
+
+        return [
+            self._handle_place_response(order, response)
+            for order, response in zip(pending, responses)
+        ]
+
+    def place_orders(self, orders: List[Tuple]) -> List[Optional[Order]]:
+        """Place several orders concurrently from synchronous code"""
+        return asyncio.run(self.place_orders_async(orders))
+
     def cancel_order(self, order_id: str) -> bool:
         """
         Cancel an order
@@ -236,19 +640,28 @@ class OrderExecutor:
         logger.info(f"Canceling order: {order_id}")
 
         if self.paper_mode:
-            if order_id in self.orders:
-                self.orders[order_id].status = OrderStatus.CANCELLED
+            order = self.orders.get(order_id)
+            if order is not None:
+                order.status = OrderStatus.CANCELLED
+                self.orders.put(order)
                 logger.info(f"[PAPER MODE] Order cancelled: {order_id}")
                 return True
             return False
 
         # Real trading
+        return self._single_flight(("cancel", order_id), lambda: self._cancel_remote(order_id))
+
+    def _cancel_remote(self, order_id: str) -> bool:
+        """Cancel an order through the API"""
         response = self._make_request("DELETE", f"/v1/orders/{order_id}")
 
         if response and response.get("success"):
-            if order_id in self.orders:
-                self.orders[order_id].status = OrderStatus.CANCELLED
-                self.orders[order_id].updated_at = datetime.now()
+            self._account_cache.clear()
+            order = self.orders.get(order_id)
+            if order is not None:
+                order.status = OrderStatus.CANCELLED
+                order.touch()
+                self.orders.put(order)
             logger.info(f"Order cancelled successfully: {order_id}")
             return True
         else:
@@ -262,16 +675,21 @@ class OrderExecutor:
         if self.paper_mode:
             return self.orders.get(order_id)
 
+        return self._single_flight(("status", order_id), lambda: self._fetch_order_status(order_id))
+
+    def _fetch_order_status(self, order_id: str) -> Optional[Order]:
+        """Fetch an order's status from the API and update the local order"""
         response = self._make_request("GET", f"/v1/orders/{order_id}")
 
         if response and response.get("success"):
             order_data = response.get("data", {})
-            if order_id in self.orders:
-                order = self.orders[order_id]
+            order = self.orders.get(order_id)
+            if order is not None:
                 order.status = OrderStatus[order_data.get("status", "PENDING")]
                 order.filled_quantity = order_data.get("filledQuantity", 0)
                 order.avg_filled_price = order_data.get("avgFilledPrice", 0.0)
-                order.updated_at = datetime.now()
+                order.touch()
+                self.orders.put(order)
                 return order
 
         return None
@@ -285,7 +703,7 @@ class OrderExecutor:
             logger.info(f"[PAPER MODE] Positions: {self.paper_positions}")
             return self.paper_positions.copy()
 
-        response = self._make_request("GET", f"/v1/accounts/{self.account_id}/positions")
+        response = self._cached_get(f"/v1/accounts/{self.account_id}/positions")
 
         if response and response.get("success"):
             positions = {}
@@ -311,7 +729,7 @@ class OrderExecutor:
                 "positions_value": 0,
             }
 
-        response = self._make_request("GET", f"/v1/accounts/{self.account_id}/balance")
+        response = self._cached_get(f"/v1/accounts/{self.account_id}/balance")
 
         if response and response.get("success"):
             data = response.get("data", {})
@@ -329,10 +747,8 @@ class OrderExecutor:
         Get order history
         """
         if self.paper_mode:
-            orders = list(self.orders.values())
-            if symbol:
-                orders = [o for o in orders if o.symbol == symbol.upper()]
-            return orders
+            since_ns = time.time_ns() - days * 86_400 * 1_000_000_000
+            return self.orders.values(symbol, since_ns)
 
         params = {"days": days}
         if symbol:
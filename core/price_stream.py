@@ -2,20 +2,50 @@
 MQTT Price Streaming Module
 Handles real-time price data streaming from DNSE via MQTT
 """
-import json
 import time
-from typing import Callable, Dict, List, Optional, Set
+from operator import itemgetter
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
 from datetime import datetime
 from threading import Thread, Lock
+import numpy as np
+import orjson
 import paho.mqtt.client as mqtt
 from loguru import logger
 from utils.config import settings
 
+# Numeric PriceData fields kept as per-symbol rows in PriceStreamManager
+PRICE_FIELDS = (
+    "price", "bid_price", "ask_price", "high", "low",
+    "open", "close", "change", "change_percent",
+)
+VOLUME_FIELDS = ("volume", "bid_volume", "ask_volume")
+
+# C-level extraction of a full tick's numeric fields in one call each
+_get_price_fields = itemgetter(*PRICE_FIELDS)
+_get_volume_fields = itemgetter(*VOLUME_FIELDS)
+
+# Initial symbol rows; grows by doubling
+INITIAL_SYMBOL_ROWS = 256
+
+# Threshold operator -> (direction, inclusive); a threshold fires when
+# direction * (price - value) > 0, or == 0 for inclusive operators
+_THRESHOLD_OPS = {
+    ">": (1.0, False),
+    ">=": (1.0, True),
+    "<": (-1.0, False),
+    "<=": (-1.0, True),
+}
+
 
 class PriceData:
     """Price data model"""
 
-    def __init__(self, data: Dict):
+    __slots__ = (
+        "symbol", "price", "volume", "bid_price", "ask_price", "bid_volume", "ask_volume",
+        "high", "low", "open", "close", "change", "change_percent", "timestamp",
+    )
+
+    def __init__(self, data: Dict, timestamp: Optional[datetime] = None):
         self.symbol: str = data.get("symbol", "")
         self.price: float = data.get("price", 0.0)
         self.volume: int = data.get("volume", 0)
@@ -29,7 +59,7 @@ class PriceData:
         self.close: float = data.get("close", 0.0)
         self.change: float = data.get("change", 0.0)
         self.change_percent: float = data.get("change_percent", 0.0)
-        self.timestamp: datetime = datetime.fromisoformat(
+        self.timestamp: datetime = timestamp or datetime.fromisoformat(
             data.get("timestamp", datetime.now().isoformat())
         )
 
@@ -61,10 +91,29 @@ class PriceStreamManager:
 
     def __init__(self):
         self.client: Optional[mqtt.Client] = None
-        self.subscribed_symbols: Set[str] = set()
-        self.callbacks: List[Callable[[PriceData], None]] = []
-        self.latest_prices: Dict[str, PriceData] = {}
+        # Immutable snapshot replaced under the lock; the MQTT thread reads it lock-free
+        self.subscribed_symbols: FrozenSet[str] = frozenset()
+        # Copy-on-write: replaced (never mutated) under the lock, read lock-free per tick
+        self.callbacks: Tuple[Callable[[PriceData], None], ...] = ()
+        # Guards callback and symbol-row registration; per-tick writes need no lock
         self.lock = Lock()
+
+        # Latest tick per symbol as one row of numeric columns; PriceData is
+        # only materialized when asked for
+        self._symbol_rows: Dict[str, int] = {}
+        self._prices = np.zeros((INITIAL_SYMBOL_ROWS, len(PRICE_FIELDS)), dtype=np.float64)
+        self._volumes = np.zeros((INITIAL_SYMBOL_ROWS, len(VOLUME_FIELDS)), dtype=np.int64)
+        self._timestamps: List[Optional[datetime]] = [None] * INITIAL_SYMBOL_ROWS
+        # Per-row write sequence (odd while a tick is being written) so readers
+        # can detect a row that changed under them and re-read it
+        self._row_seqs: List[int] = [0] * INITIAL_SYMBOL_ROWS
+
+        # Price thresholds: specs by id, compiled per symbol into
+        # (values, directions, inclusive, actions) and swapped in whole
+        self._threshold_specs: Dict[int, Tuple[str, str, float, Callable[[PriceData], None]]] = {}
+        self._thresholds: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray, List[Callable]]] = {}
+        self._next_threshold_id = 0
+
         self.is_connected = False
         self.reconnect_delay = 5
         self.max_reconnect_delay = 60
@@ -72,42 +121,186 @@ class PriceStreamManager:
     def add_callback(self, callback: Callable[[PriceData], None]):
         """Add a callback function to be called when price data is received"""
         with self.lock:
-            self.callbacks.append(callback)
+            self.callbacks = self.callbacks + (callback,)
         logger.info(f"Added price callback: {callback.__name__}")
 
     def remove_callback(self, callback: Callable[[PriceData], None]):
         """Remove a callback function"""
         with self.lock:
             if callback in self.callbacks:
-                self.callbacks.remove(callback)
+                callbacks = list(self.callbacks)
+                callbacks.remove(callback)
+                self.callbacks = tuple(callbacks)
         logger.info(f"Removed price callback: {callback.__name__}")
 
+    def register_threshold(
+        self,
+        symbol: str,
+        op: str,
+        value: float,
+        action: Callable[[PriceData], None],
+    ) -> int:
+        """
+        Call action on ticks where the price crosses a threshold
+
+        All thresholds for a symbol are checked with one vectorized comparison
+        per tick, so simple numeric filters need no per-callback dispatch.
+
+        Args:
+            symbol: Stock symbol
+            op: Comparison of tick price against value (">", ">=", "<", "<=")
+            value: Threshold price
+            action: Called with the tick's PriceData when the comparison holds
+
+        Returns:
+            Threshold id for remove_threshold
+        """
+        if op not in _THRESHOLD_OPS:
+            raise ValueError(f"Unsupported threshold operator: {op}")
+
+        symbol = symbol.upper()
+        with self.lock:
+            threshold_id = self._next_threshold_id
+            self._next_threshold_id += 1
+            self._threshold_specs[threshold_id] = (symbol, op, float(value), action)
+            self._compile_thresholds(symbol)
+        return threshold_id
+
+    def remove_threshold(self, threshold_id: int):
+        """Remove a threshold registered with register_threshold"""
+        with self.lock:
+            spec = self._threshold_specs.pop(threshold_id, None)
+            if spec:
+                self._compile_thresholds(spec[0])
+
+    def _compile_thresholds(self, symbol: str):
+        """Rebuild one symbol's threshold arrays (caller holds the lock)"""
+        ids = [i for i, spec in self._threshold_specs.items() if spec[0] == symbol]
+        thresholds = dict(self._thresholds)
+
+        if ids:
+            specs = [self._threshold_specs[i] for i in ids]
+            thresholds[symbol] = (
+                np.array([spec[2] for spec in specs], dtype=np.float64),
+                np.array([_THRESHOLD_OPS[spec[1]][0] for spec in specs], dtype=np.float64),
+                np.array([_THRESHOLD_OPS[spec[1]][1] for spec in specs], dtype=np.bool_),
+                [spec[3] for spec in specs],
+            )
+        else:
+            thresholds.pop(symbol, None)
+
+        self._thresholds = thresholds
+
+    def _fire_thresholds(self, symbol: str, price: float) -> List[Callable]:
+        """Actions whose thresholds the price satisfies"""
+        compiled = self._thresholds.get(symbol.upper())
+        if not compiled:
+            return []
+
+        values, directions, inclusive, actions = compiled
+        diff = directions * (price - values)
+        hit = (diff > 0) | (inclusive & (diff == 0))
+        return [actions[i] for i in np.flatnonzero(hit)]
+
     def subscribe(self, symbols: List[str]):
-        """Subscribe to price updates for given symbols"""
-        for symbol in symbols:
-            symbol = symbol.upper()
-            if symbol not in self.subscribed_symbols:
-                self.subscribed_symbols.add(symbol)
-                if self.client and self.is_connected:
-                    topic = f"market/price/{symbol}"
-                    self.client.subscribe(topic)
-                    logger.info(f"Subscribed to {topic}")
+        """Subscribe to price updates for given symbols (one SUBSCRIBE packet)"""
+        with self.lock:
+            new = [s for s in dict.fromkeys(s.upper() for s in symbols) if s not in self.subscribed_symbols]
+            if not new:
+                return
+            self.subscribed_symbols = self.subscribed_symbols.union(new)
+
+        if self.client and self.is_connected:
+            self.client.subscribe([(f"market/price/{symbol}", 0) for symbol in new])
+            logger.info(f"Subscribed to {len(new)} price topics: {', '.join(new)}")
 
     def unsubscribe(self, symbols: List[str]):
-        """Unsubscribe from price updates"""
-        for symbol in symbols:
-            symbol = symbol.upper()
-            if symbol in self.subscribed_symbols:
-                self.subscribed_symbols.remove(symbol)
-                if self.client and self.is_connected:
-                    topic = f"market/price/{symbol}"
-                    self.client.unsubscribe(topic)
-                    logger.info(f"Unsubscribed from {topic}")
+        """Unsubscribe from price updates (one UNSUBSCRIBE packet)"""
+        with self.lock:
+            removed = [s for s in dict.fromkeys(s.upper() for s in symbols) if s in self.subscribed_symbols]
+            if not removed:
+                return
+            self.subscribed_symbols = self.subscribed_symbols.difference(removed)
+
+        if self.client and self.is_connected:
+            self.client.unsubscribe([f"market/price/{symbol}" for symbol in removed])
+            logger.info(f"Unsubscribed from {len(removed)} price topics: {', '.join(removed)}")
 
     def get_latest_price(self, symbol: str) -> Optional[PriceData]:
         """Get the latest price data for a symbol"""
+        symbol = symbol.upper()
+        row = self._symbol_rows.get(symbol)
+        if row is None:
+            return None
+
+        # Lock-free read of the MQTT thread's writes: retry until the row's
+        # fields come from a single tick
+        while True:
+            seq = self._row_seqs[row]
+            if seq & 1:
+                time.sleep(0)
+                continue
+            prices = self._prices[row].tolist()
+            volumes = self._volumes[row].tolist()
+            timestamp = self._timestamps[row]
+            if self._row_seqs[row] == seq:
+                break
+
+        data = dict(zip(PRICE_FIELDS, prices))
+        data.update(zip(VOLUME_FIELDS, volumes))
+        data["symbol"] = symbol
+        return PriceData(data, timestamp)
+
+    def get_latest_prices(self, symbols: List[str]) -> np.ndarray:
+        """Latest last-traded price per symbol (NaN where none received yet)"""
+        rows = [self._symbol_rows.get(s.upper(), -1) for s in symbols]
+        prices = self._prices[rows, 0]
+        prices[np.asarray(rows) < 0] = np.nan
+        return prices
+
+    def _add_symbol_row(self, symbol: str) -> int:
+        """Allocate a row for a symbol's first tick, growing storage if full"""
         with self.lock:
-            return self.latest_prices.get(symbol.upper())
+            row = self._symbol_rows.get(symbol)
+            if row is None:
+                row = len(self._symbol_rows)
+                if row == len(self._prices):
+                    self._prices = np.concatenate((self._prices, np.zeros_like(self._prices)))
+                    self._volumes = np.concatenate((self._volumes, np.zeros_like(self._volumes)))
+                    self._timestamps.extend([None] * row)
+                    self._row_seqs.extend([0] * row)
+                self._symbol_rows[symbol] = row
+            return row
+
+    def _store_tick(self, payload: Dict, timestamp: datetime):
+        """Write a tick into its symbol's row"""
+        symbol = payload.get("symbol", "")
+        row = self._symbol_rows.get(symbol)
+        if row is None:
+            row = self._add_symbol_row(symbol)
+
+        try:
+            prices = _get_price_fields(payload)
+            volumes = _get_volume_fields(payload)
+        except KeyError:
+            # Partial tick: missing fields default to zero
+            prices = [payload.get(f, 0.0) for f in PRICE_FIELDS]
+            volumes = [payload.get(f, 0) for f in VOLUME_FIELDS]
+
+        # Convert before touching the row: a malformed field (e.g. a null volume)
+        # raises here and leaves the previous tick in place
+        prices = np.array(prices, dtype=np.float64)
+        volumes = np.array(volumes, dtype=np.int64)
+
+        # Only the MQTT thread writes rows, so the sequence needs no lock; it must
+        # end even even if a write fails, or readers would retry forever
+        self._row_seqs[row] += 1
+        try:
+            self._prices[row] = prices
+            self._volumes[row] = volumes
+            self._timestamps[row] = timestamp
+        finally:
+            self._row_seqs[row] += 1
 
     def _on_connect(self, client, userdata, flags, rc):
         """Callback when connected to MQTT broker"""
@@ -117,10 +310,10 @@ class PriceStreamManager:
             logger.info("Connected to MQTT broker successfully")
 
             # Resubscribe to all symbols
-            for symbol in self.subscribed_symbols:
-                topic = f"market/price/{symbol}"
-                client.subscribe(topic)
-                logger.info(f"Resubscribed to {topic}")
+            symbols = self.subscribed_symbols
+            if symbols:
+                client.subscribe([(f"market/price/{symbol}", 0) for symbol in symbols])
+                logger.info(f"Resubscribed to {len(symbols)} price topics")
         else:
             self.is_connected = False
             logger.error(f"Failed to connect to MQTT broker. Return code: {rc}")
@@ -136,16 +329,21 @@ class PriceStreamManager:
         """Callback when a message is received"""
         try:
             # Parse the message
-            payload = json.loads(msg.payload.decode("utf-8"))
-            price_data = PriceData(payload)
+            payload = orjson.loads(msg.payload)
+            timestamp = payload.get("timestamp")
+            timestamp = datetime.fromisoformat(timestamp) if timestamp else datetime.now()
 
             # Update latest prices
-            with self.lock:
-                self.latest_prices[price_data.symbol] = price_data
+            self._store_tick(payload, timestamp)
+
+            # Threshold actions first, then all registered callbacks
+            # (snapshot of the current tuple)
+            callbacks = self._fire_thresholds(payload.get("symbol", ""), payload.get("price", 0.0))
+            callbacks.extend(self.callbacks)
+            if not callbacks:
+                return
 
-            # Call all registered callbacks
-            with self.lock:
-                callbacks = self.callbacks.copy()
+            price_data = PriceData(payload, timestamp)
 
             for callback in callbacks:
                 try:
@@ -153,7 +351,7 @@ class PriceStreamManager:
                 except Exception as e:
                     logger.error(f"Error in price callback {callback.__name__}: {e}")
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to decode MQTT message: {e}")
         except Exception as e:
             logger.error(f"Error processing MQTT message: {e}")
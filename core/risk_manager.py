@@ -4,14 +4,27 @@ Manages trading risk, position sizing, and stop-loss logic
 Implements "virtual stop loss" since Vietnam market doesn't have standard stop loss
 """
 from typing import Dict, List, Optional, Tuple
+import sys
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import math
+import numpy as np
 from loguru import logger
 from utils.config import settings
 from core.order_executor import Order, OrderSide, OrderType, order_executor
 
+# dataclass slots need Python 3.10+; older interpreters keep the instance __dict__
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Columns of RiskManager._levels
+_ENTRY, _INV_ENTRY, _CURRENT, _STOP, _TAKE_PROFIT = range(5)
+
+# monitor_positions trails the stop this far below price once a position is this far in profit
+TRAILING_TRIGGER_PCT = 0.05
+TRAILING_STOP_PCT = 0.03
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class Position:
     """Position model"""
 
@@ -24,19 +37,25 @@ class Position:
     entry_time: datetime = None
     pnl: float = 0.0
     pnl_percent: float = 0.0
+    # 1 / avg_entry_price, which is fixed for the life of the position
+    _inv_entry: float = field(default=0.0, init=False, repr=False, compare=False)
+    # take_profit_price, or +inf when there is no target so it never triggers
+    _tp_trigger: float = field(default=math.inf, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.entry_time is None:
             self.entry_time = datetime.now()
+        self._inv_entry = 1.0 / self.avg_entry_price
+        if self.take_profit_price is not None:
+            self._tp_trigger = self.take_profit_price
         self.update_pnl(self.current_price)
 
     def update_pnl(self, current_price: float):
         """Update P&L based on current price"""
         self.current_price = current_price
-        self.pnl = (current_price - self.avg_entry_price) * self.quantity
-        self.pnl_percent = (
-            (current_price - self.avg_entry_price) / self.avg_entry_price
-        )
+        change = current_price - self.avg_entry_price
+        self.pnl = change * self.quantity
+        self.pnl_percent = change * self._inv_entry
 
     def should_stop_loss(self) -> bool:
         """Check if stop loss should be triggered"""
@@ -44,9 +63,7 @@ class Position:
 
     def should_take_profit(self) -> bool:
         """Check if take profit should be triggered"""
-        if self.take_profit_price is None:
-            return False
-        return self.current_price >= self.take_profit_price
+        return self.current_price >= self._tp_trigger
 
     def to_dict(self) -> Dict:
         return {
@@ -79,6 +96,19 @@ class RiskManager:
         self.max_drawdown = 0.0
         self.peak_capital = self.initial_capital
 
+        # Audit-trail logger, bound once rather than per trade
+        self._trade_log = logger.bind(TRADE=True)
+
+        # Running sums of pnl and quantity * current_price over open positions
+        self._total_pnl = 0.0
+        self._total_position_value = 0.0
+
+        # Price levels of the open positions, one row each in self.positions order,
+        # so monitor_positions can test every stop and target in one pass
+        self._symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._levels = np.empty((max(settings.max_positions, 1), 5))
+
         # Risk parameters from settings
         self.max_position_size = settings.max_position_size
         self.max_positions = settings.max_positions
@@ -113,9 +143,14 @@ class RiskManager:
         # Round down to lot size (100 shares in Vietnam)
         shares = (shares // 100) * 100
 
-        logger.info(
-            f"Position size for {symbol}: {shares} shares @ {entry_price:.2f} "
-            f"(risk: {risk_amount:,.0f} VND, {self.risk_per_trade*100}%)"
+        # Called for every BUY bar in backtests; only format when DEBUG is enabled
+        logger.opt(lazy=True).debug(
+            "Position size for {}: {} shares @ {} (risk: {} VND, {}%)",
+            lambda: symbol,
+            lambda: shares,
+            lambda: f"{entry_price:.2f}",
+            lambda: f"{risk_amount:,.0f}",
+            lambda: self.risk_per_trade * 100,
         )
 
         return shares
@@ -195,9 +230,12 @@ class RiskManager:
         )
 
         self.positions[symbol] = position
+        self._track(position)
         self.current_capital -= position_value
+        self._total_pnl += position.pnl
+        self._total_position_value += position_value
 
-        logger.bind(TRADE=True).info(
+        self._trade_log.info(
             f"OPEN POSITION: {symbol} | Qty: {quantity} | Entry: {entry_price:.2f} | "
             f"Stop Loss: {stop_loss_price:.2f} | Capital: {self.current_capital:,.0f}"
         )
@@ -213,6 +251,8 @@ class RiskManager:
             return False
 
         position = self.positions[symbol]
+        self._total_pnl -= position.pnl
+        self._total_position_value -= position.quantity * position.current_price
         position.update_pnl(exit_price)
 
         # Update capital
@@ -226,7 +266,7 @@ class RiskManager:
             drawdown = (self.peak_capital - self.current_capital) / self.peak_capital
             self.max_drawdown = max(self.max_drawdown, drawdown)
 
-        logger.bind(TRADE=True).info(
+        self._trade_log.info(
             f"CLOSE POSITION: {symbol} | Exit: {exit_price:.2f} | "
             f"P&L: {position.pnl:+,.0f} VND ({position.pnl_percent:+.2%}) | "
             f"Reason: {reason} | Capital: {self.current_capital:,.0f}"
@@ -234,15 +274,30 @@ class RiskManager:
 
         # Remove position
         del self.positions[symbol]
+        self._untrack(symbol)
+        if not self.positions:
+            # Drop accumulated rounding error
+            self._total_pnl = 0.0
+            self._total_position_value = 0.0
 
         return True
 
-    def update_position_price(self, symbol: str, current_price: float):
+    def update_position_price(self, symbol: str, current_price: float) -> bool:
         """
         Update position with current price
+        Returns True if the price has reached the position's stop loss or take profit
         """
-        if symbol in self.positions:
-            self.positions[symbol].update_pnl(current_price)
+        position = self.positions.get(symbol)
+        if position is None:
+            return False
+
+        old_pnl = position.pnl
+        old_value = position.quantity * position.current_price
+        position.update_pnl(current_price)
+        self._levels[self._index[symbol], _CURRENT] = current_price
+        self._total_pnl += position.pnl - old_pnl
+        self._total_position_value += position.quantity * current_price - old_value
+        return current_price <= position.stop_loss_price or current_price >= position._tp_trigger
 
     def check_stop_loss(self, symbol: str) -> bool:
         """
@@ -323,6 +378,7 @@ class RiskManager:
         if new_stop > position.stop_loss_price:
             old_stop = position.stop_loss_price
             position.stop_loss_price = new_stop
+            self._levels[self._index[symbol], _STOP] = new_stop
             logger.info(
                 f"TRAILING STOP UPDATE: {symbol} | "
                 f"Old: {old_stop:.2f} -> New: {new_stop:.2f} | "
@@ -332,34 +388,80 @@ class RiskManager:
     def monitor_positions(self):
         """
         Monitor all positions for stop loss and take profit triggers
-        Should be called regularly (e.g., every time price updates)
+        Should be called regularly (e.g., on a fixed interval)
         """
-        symbols_to_check = list(self.positions.keys())
+        n = len(self._symbols)
+        if not n:
+            return
+
+        # Only positions whose stop, target or trailing stop is due need the
+        # per-position checks below
+        levels = self._levels[:n]
+        entry = levels[:, _ENTRY]
+        inv_entry = levels[:, _INV_ENTRY]
+        current = levels[:, _CURRENT]
+        stop = levels[:, _STOP]
+        due = (current <= stop) | (current >= levels[:, _TAKE_PROFIT])
+        due |= ((current - entry) * inv_entry > TRAILING_TRIGGER_PCT) & (
+            current * (1 - TRAILING_STOP_PCT) > stop
+        )
+        # Snapshot the due symbols: closing a position shifts the later indices
+        symbols = self._symbols
+        symbols_to_check = [symbols[i] for i in np.flatnonzero(due).tolist()]
 
         for symbol in symbols_to_check:
-            # Check stop loss first (higher priority)
-            if self.check_stop_loss(symbol):
-                continue
+            self.check_position(symbol)
 
-            # Then check take profit
-            if self.check_take_profit(symbol):
-                continue
+    def check_position(self, symbol: str):
+        """Run the stop loss, take profit and trailing stop checks for one position"""
+        # Check stop loss first (higher priority)
+        if self.check_stop_loss(symbol):
+            return
 
-            # Update trailing stop if position is profitable
-            position = self.positions.get(symbol)
-            if position and position.pnl_percent > 0.05:  # 5% profit
-                self.update_trailing_stop(symbol, trailing_pct=0.03)
+        # Then check take profit
+        if self.check_take_profit(symbol):
+            return
 
-    def get_portfolio_summary(self) -> Dict:
+        # Update trailing stop if position is profitable
+        position = self.positions.get(symbol)
+        if position and position.pnl_percent > TRAILING_TRIGGER_PCT:
+            self.update_trailing_stop(symbol, trailing_pct=TRAILING_STOP_PCT)
+
+    def _track(self, position: Position):
+        """Append a row to _levels for a newly opened position"""
+        n = len(self._symbols)
+        if n == len(self._levels):
+            self._levels = np.concatenate((self._levels, np.empty_like(self._levels)))
+
+        self._levels[n] = (
+            position.avg_entry_price,
+            position._inv_entry,
+            position.current_price,
+            position.stop_loss_price,
+            position._tp_trigger,
+        )
+        self._index[position.symbol] = n
+        self._symbols.append(position.symbol)
+
+    def _untrack(self, symbol: str):
+        """Remove a closed position's row, keeping the remaining rows in order"""
+        i = self._index.pop(symbol)
+        n = len(self._symbols)
+        self._levels[i:n - 1] = self._levels[i + 1:n]
+        del self._symbols[i]
+        for later in self._symbols[i:]:
+            self._index[later] -= 1
+
+    def get_portfolio_summary(self, include_positions: bool = False) -> Dict:
         """
         Get portfolio summary statistics
+        Totals are maintained as positions change; the per-position list is only
+        built when include_positions is set
         """
-        total_pnl = sum(pos.pnl for pos in self.positions.values())
-        total_position_value = sum(
-            pos.quantity * pos.current_price for pos in self.positions.values()
-        )
+        total_pnl = self._total_pnl
+        total_position_value = self._total_position_value
 
-        return {
+        summary = {
             "initial_capital": self.initial_capital,
             "current_capital": self.current_capital,
             "total_position_value": total_position_value,
@@ -371,8 +473,11 @@ class RiskManager:
             ),
             "max_drawdown": self.max_drawdown,
             "num_positions": len(self.positions),
-            "positions": [pos.to_dict() for pos in self.positions.values()],
         }
+        if include_positions:
+            summary["positions"] = [pos.to_dict() for pos in self.positions.values()]
+
+        return summary
 
 
 # Global instance
@@ -2,14 +2,62 @@
 Signal Engine Module
 Analyzes price data and generates trading signals based on technical indicators
 """
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from collections import deque
 from enum import Enum
 from datetime import datetime, timedelta
-from collections import deque
+from functools import wraps
+import time
 import pandas as pd
 import numpy as np
 from loguru import logger
 from utils.config import settings
+from core._indicator_kernels import (
+    NUMBA_AVAILABLE,
+    bollinger_last,
+    ema_last,
+    rsi_last,
+    signal_indicators,
+    signal_indicators_batch,
+    signal_indicators_batch_parallel,
+    sma_last,
+    volatility_last,
+    warm_up,
+)
+
+
+# Bars needed before generate_signal emits anything, and the bars its window
+# indicators (SMA50, support/resistance) look back over
+MIN_SIGNAL_HISTORY = 30
+SIGNAL_WINDOW = 50
+
+# Symbols per generate_signals call from which the window kernel runs across
+# threads; below this, starting the threads costs more than it saves
+PARALLEL_SIGNAL_SYMBOLS = 200
+
+# EMA periods and RSI period PriceHistory maintains incrementally
+TRACKED_EMA_PERIODS = (12, 26)
+TRACKED_RSI_PERIOD = 14
+
+
+def _per_tick(method: Callable) -> Callable:
+    """Memoize a SignalEngine indicator until the symbol's next price update"""
+    name = method.__name__
+
+    @wraps(method)
+    def wrapper(self, symbol: str, *args, **kwargs):
+        history = self.price_histories.get(symbol)
+        if history is None:
+            return method(self, symbol, *args, **kwargs)
+
+        key = (name, *args, *kwargs.items())
+        cache = history.indicator_cache
+        if key in cache:
+            return cache[key]
+        value = cache[key] = method(self, symbol, *args, **kwargs)
+        return value
+
+    return wrapper
 
 
 class SignalType(Enum):
@@ -29,9 +77,64 @@ class SignalStrength(Enum):
     STRONG = 3
 
 
+# generate_signal rules, in the order their reasons are listed
+(
+    _BREAKOUT,
+    _AT_SUPPORT,
+    _BREAKING_SUPPORT,
+    _GOLDEN_CROSS,
+    _DEATH_CROSS,
+    _OVERSOLD,
+    _OVERBOUGHT,
+    _VOLUME_SURGE,
+    _HIGH_VOLATILITY,
+) = range(9)
+_RULE_COUNT = 9
+
+# Rules whose reasons are quoted for each outcome; a BUY quotes the crossover and
+# support reasons whichever way they point, a SELL quotes either crossover
+_BUY_REASONS = sum(
+    1 << rule
+    for rule in (
+        _BREAKOUT, _AT_SUPPORT, _BREAKING_SUPPORT, _GOLDEN_CROSS, _DEATH_CROSS, _OVERSOLD, _VOLUME_SURGE
+    )
+)
+_SELL_REASONS = sum(1 << rule for rule in (_BREAKING_SUPPORT, _GOLDEN_CROSS, _DEATH_CROSS, _OVERBOUGHT))
+_CUTLOSS_REASONS = 1 << _HIGH_VOLATILITY
+
+# Rule ids set in each possible mask, in rule order
+_RULES_IN_MASK = tuple(
+    tuple(rule for rule in range(_RULE_COUNT) if mask >> rule & 1)
+    for mask in range(1 << _RULE_COUNT)
+)
+
+# Signal strength by number of agreeing rules (capped at 3)
+_STRENGTH_BY_COUNT = (
+    SignalStrength.WEAK,
+    SignalStrength.WEAK,
+    SignalStrength.MODERATE,
+    SignalStrength.STRONG,
+)
+
+
+def _ns_to_datetime(ns: int) -> datetime:
+    """Local naive datetime for an epoch timestamp in nanoseconds"""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000)
+
+
+def _join_reasons(reasons: List[Optional[str]], mask: int) -> str:
+    """Join the reasons of the rules set in mask, in rule order"""
+    return " | ".join([reasons[rule] for rule in _RULES_IN_MASK[mask]])
+
+
 class TradingSignal:
     """Trading signal model"""
 
+    __slots__ = (
+        "symbol", "signal_type", "strength", "price", "reason", "indicators", "timestamp_ns",
+    )
+
     def __init__(
         self,
         symbol: str,
@@ -47,7 +150,12 @@ class TradingSignal:
         self.price = price
         self.reason = reason
         self.indicators = indicators or {}
-        self.timestamp = datetime.now()
+        self.timestamp_ns = time.time_ns()
+
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time; stored as epoch nanoseconds and converted on access"""
+        return _ns_to_datetime(self.timestamp_ns)
 
     def __repr__(self):
         return f"Signal({self.symbol}, {self.signal_type.value}, {self.strength.value}, {self.price}, {self.reason})"
@@ -65,46 +173,201 @@ class TradingSignal:
 
 
 class PriceHistory:
-    """Maintains price history for a symbol"""
+    """
+    Maintains price history for a symbol
+    Columns are preallocated NumPy buffers of twice max_size; the retained samples
+    are always contiguous, so reads are slice views rather than copies
+    """
+
+    __slots__ = (
+        "symbol", "max_size", "_closes", "_volumes", "_highs", "_lows", "_timestamps",
+        "_columns", "_start", "_end", "ema", "_ema_alphas", "_gain_sum", "_loss_sum",
+        "_gain_count", "_loss_count", "volume_sum", "bar_id", "_level_window",
+        "_resistance_bars", "_support_bars", "indicator_cache",
+    )
 
     def __init__(self, symbol: str, max_size: int = 500):
         self.symbol = symbol
         self.max_size = max_size
-        self.prices = deque(maxlen=max_size)
-        self.volumes = deque(maxlen=max_size)
-        self.timestamps = deque(maxlen=max_size)
-        self.highs = deque(maxlen=max_size)
-        self.lows = deque(maxlen=max_size)
-
-    def add(self, price: float, volume: int, high: float, low: float, timestamp: datetime = None):
-        """Add a new price point"""
-        self.prices.append(price)
-        self.volumes.append(volume)
-        self.highs.append(high)
-        self.lows.append(low)
-        self.timestamps.append(timestamp or datetime.now())
+        capacity = 2 * max_size
+        self._closes = np.empty(capacity, dtype=np.float64)
+        self._volumes = np.empty(capacity, dtype=np.int64)
+        self._highs = np.empty(capacity, dtype=np.float64)
+        self._lows = np.empty(capacity, dtype=np.float64)
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._columns = (self._closes, self._volumes, self._highs, self._lows, self._timestamps)
+        self._start = 0
+        self._end = 0
+
+        # Running indicator state updated by add(), so reads are O(1):
+        # EMA per tracked period, gain/loss sums (and how many nonzero moves feed
+        # them) over the last TRACKED_RSI_PERIOD changes, and the retained volume sum
+        self.ema: Dict[int, float] = {}
+        self._ema_alphas = {period: 2.0 / (period + 1) for period in TRACKED_EMA_PERIODS}
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._gain_count = 0
+        self._loss_count = 0
+        self.volume_sum = 0
+
+        # Support/resistance over the last SIGNAL_WINDOW bars as monotonic deques of
+        # (bar_id, level): highs decreasing and lows increasing from the left, so the
+        # leftmost entry is the window's extreme; bar_id counts every add()
+        self.bar_id = 0
+        self._level_window = min(SIGNAL_WINDOW, max_size)
+        self._resistance_bars: Deque[Tuple[int, float]] = deque()
+        self._support_bars: Deque[Tuple[int, float]] = deque()
+
+        # Window indicators computed since the last add(), keyed by (method, *args)
+        self.indicator_cache: Dict[Tuple, Any] = {}
+
+    def add(self, price: float, volume: int, high: float, low: float, ts_ns: int = None):
+        """Add a new price point, timestamped in epoch nanoseconds (default now)"""
+        self.indicator_cache.clear()
+        end = self._end
+        if end == len(self._closes):
+            # Buffer full: move the retained samples to the front, once every max_size adds
+            keep = self.max_size - 1
+            for column in self._columns:
+                column[:keep] = column[end - keep:end]
+            self._start = 0
+            end = keep
+            self._resync_state(end)
+
+        closes = self._closes
+        closes[end] = price
+        self._volumes[end] = volume
+        self._highs[end] = high
+        self._lows[end] = low
+        self._timestamps[end] = time.time_ns() if ts_ns is None else ts_ns
+
+        # Incremental indicator state
+        if end > self._start:
+            ema = self.ema
+            for period, alpha in self._ema_alphas.items():
+                ema[period] += alpha * (price - ema[period])
+            self._add_change(price - float(closes[end - 1]), 1)
+            # The change leaving the RSI window, if its older close is still retained
+            oldest = end - TRACKED_RSI_PERIOD - 1
+            if oldest >= self._start:
+                self._add_change(float(closes[oldest + 1] - closes[oldest]), -1)
+        else:
+            self.ema = dict.fromkeys(self._ema_alphas, float(price))
+        self.volume_sum += int(self._volumes[end])
+
+        self.bar_id = bar = self.bar_id + 1
+        expired = bar - self._level_window
+        resistance_bars = self._resistance_bars
+        while resistance_bars and resistance_bars[-1][1] <= high:
+            resistance_bars.pop()
+        resistance_bars.append((bar, float(high)))
+        if resistance_bars[0][0] <= expired:
+            resistance_bars.popleft()
+        support_bars = self._support_bars
+        while support_bars and support_bars[-1][1] >= low:
+            support_bars.pop()
+        support_bars.append((bar, float(low)))
+        if support_bars[0][0] <= expired:
+            support_bars.popleft()
+
+        self._end = end + 1
+        if self._end - self._start > self.max_size:
+            self.volume_sum -= int(self._volumes[self._start])
+            self._start += 1
+
+    def _add_change(self, delta: float, sign: int):
+        """Add (sign=1) or remove (sign=-1) one price change from the RSI sums"""
+        if delta > 0:
+            self._gain_sum += sign * delta
+            self._gain_count += sign
+        elif delta < 0:
+            self._loss_sum -= sign * delta
+            self._loss_count += sign
+
+    def _resync_state(self, end: int):
+        """Recompute the running sums exactly from the retained samples after compaction"""
+        self.volume_sum = int(self._volumes[:end].sum())
+        delta = np.diff(self._closes[max(end - TRACKED_RSI_PERIOD - 1, 0):end])
+        gains = delta[delta > 0]
+        losses = delta[delta < 0]
+        self._gain_sum = float(gains.sum())
+        self._loss_sum = float(-losses.sum())
+        self._gain_count = len(gains)
+        self._loss_count = len(losses)
+
+    @property
+    def rsi(self) -> Optional[float]:
+        """RSI over the last TRACKED_RSI_PERIOD changes, None until there are enough"""
+        if len(self) <= TRACKED_RSI_PERIOD:
+            return None
+        # Counts guard the sums: a window with no moves is exactly zero, not drift
+        gain = self._gain_sum if self._gain_count else 0.0
+        loss = self._loss_sum if self._loss_count else 0.0
+        if loss == 0.0:
+            return 100.0 if gain > 0.0 else float("nan")
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    @property
+    def resistance(self) -> float:
+        """Highest high of the last SIGNAL_WINDOW bars"""
+        return self._resistance_bars[0][1]
+
+    @property
+    def support(self) -> float:
+        """Lowest low of the last SIGNAL_WINDOW bars"""
+        return self._support_bars[0][1]
+
+    @property
+    def prices(self) -> np.ndarray:
+        """Close prices, oldest first (view into the buffer)"""
+        return self._closes[self._start:self._end]
+
+    @property
+    def volumes(self) -> np.ndarray:
+        """Volumes, oldest first (view into the buffer)"""
+        return self._volumes[self._start:self._end]
+
+    @property
+    def highs(self) -> np.ndarray:
+        """Highs, oldest first (view into the buffer)"""
+        return self._highs[self._start:self._end]
+
+    @property
+    def lows(self) -> np.ndarray:
+        """Lows, oldest first (view into the buffer)"""
+        return self._lows[self._start:self._end]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamps in epoch nanoseconds, oldest first (view into the buffer)"""
+        return self._timestamps[self._start:self._end]
+
+    def window(self, n: int) -> np.ndarray:
+        """Last n close prices (fewer if the history is shorter)"""
+        return self._closes[max(self._start, self._end - n):self._end]
 
     def get_dataframe(self, periods: int = None) -> pd.DataFrame:
-        """Get price history as pandas DataFrame"""
-        if not self.prices:
+        """Get price history as pandas DataFrame, with UTC timestamps"""
+        n = len(self)
+        if not n:
             return pd.DataFrame()
 
+        # Slice the buffers before building the frame rather than tail() after;
+        # the index still numbers rows from the oldest retained sample
+        k = min(periods, n) if periods else n
+        rows = slice(self._end - k, self._end)
         data = {
-            "timestamp": list(self.timestamps),
-            "close": list(self.prices),
-            "volume": list(self.volumes),
-            "high": list(self.highs),
-            "low": list(self.lows),
+            "timestamp": pd.to_datetime(self._timestamps[rows], unit="ns", utc=True),
+            "close": self._closes[rows],
+            "volume": self._volumes[rows],
+            "high": self._highs[rows],
+            "low": self._lows[rows],
         }
 
-        df = pd.DataFrame(data)
-        if periods:
-            df = df.tail(periods)
-
-        return df
+        return pd.DataFrame(data, index=pd.RangeIndex(n - k, n))
 
     def __len__(self):
-        return len(self.prices)
+        return self._end - self._start
 
 
 class SignalEngine:
@@ -120,7 +383,22 @@ class SignalEngine:
 
     def __init__(self):
         self.price_histories: Dict[str, PriceHistory] = {}
-        self.support_resistance_cache: Dict[str, Tuple[float, float]] = {}
+        # Last signal per symbol with the bar_id it was computed at, so repeat calls
+        # between price updates (UI polling) return it without re-evaluating
+        self._last_signal: Dict[str, Tuple[int, TradingSignal]] = {}
+        self.reload_settings()
+
+    def reload_settings(self):
+        """Snapshot the strategy settings read on every signal; call again after changing them"""
+        self._enable_breakout = bool(settings.enable_breakout_strategy)
+        self._enable_support_resistance = bool(settings.enable_support_resistance_strategy)
+        self._enable_volatility_cutloss = bool(settings.enable_volatility_cutloss)
+        self._volatility_threshold = float(settings.volatility_threshold)
+        self._last_signal.clear()
+
+    def warm_up(self):
+        """Prepare the compiled indicator kernels ahead of the first price update"""
+        warm_up()
 
     def update_price(self, symbol: str, price: float, volume: int, high: float, low: float):
         """Update price history for a symbol"""
@@ -129,67 +407,76 @@ class SignalEngine:
 
         self.price_histories[symbol].add(price, volume, high, low)
 
+    @_per_tick
     def calculate_sma(self, symbol: str, period: int) -> Optional[float]:
         """Calculate Simple Moving Average"""
-        if symbol not in self.price_histories:
+        history = self.price_histories.get(symbol)
+        if history is None or len(history) < period:
             return None
 
-        df = self.price_histories[symbol].get_dataframe()
-        if len(df) < period:
-            return None
-
-        return df["close"].tail(period).mean()
+        if NUMBA_AVAILABLE:
+            return sma_last(history.prices, period)
+        return float(history.window(period).mean())
 
     def calculate_ema(self, symbol: str, period: int) -> Optional[float]:
         """Calculate Exponential Moving Average"""
-        if symbol not in self.price_histories:
+        history = self.price_histories.get(symbol)
+        if history is None or len(history) < period:
             return None
 
-        df = self.price_histories[symbol].get_dataframe()
-        if len(df) < period:
-            return None
+        if period in history.ema:
+            return history.ema[period]
 
-        return df["close"].ewm(span=period, adjust=False).mean().iloc[-1]
+        if NUMBA_AVAILABLE:
+            return ema_last(history.prices, period)
+
+        # ewm(span=period, adjust=False) unrolled: the first close is weighted (1-a)^(n-1),
+        # close i after it a*(1-a)^(n-1-i)
+        closes = history.prices
+        alpha = 2.0 / (period + 1)
+        weights = (1.0 - alpha) ** np.arange(len(closes) - 1, -1, -1)
+        weights[1:] *= alpha
+        return float(weights @ closes)
 
     def calculate_rsi(self, symbol: str, period: int = 14) -> Optional[float]:
         """Calculate Relative Strength Index"""
-        if symbol not in self.price_histories:
+        history = self.price_histories.get(symbol)
+        if history is None or len(history) < period + 1:
             return None
 
-        df = self.price_histories[symbol].get_dataframe()
-        if len(df) < period + 1:
-            return None
+        if period == TRACKED_RSI_PERIOD:
+            return history.rsi
 
-        # Calculate price changes
-        delta = df["close"].diff()
+        if NUMBA_AVAILABLE:
+            return rsi_last(history.prices, period)
 
-        # Separate gains and losses
-        gains = delta.where(delta > 0, 0)
-        losses = -delta.where(delta < 0, 0)
+        # Price changes over the last period
+        delta = np.diff(history.window(period + 1))
 
-        # Calculate average gains and losses
-        avg_gains = gains.rolling(window=period).mean()
-        avg_losses = losses.rolling(window=period).mean()
+        # Average gains and losses
+        avg_gain = delta[delta > 0].sum() / period
+        avg_loss = -delta[delta < 0].sum() / period
 
         # Calculate RS and RSI
-        rs = avg_gains / avg_losses
-        rsi = 100 - (100 / (1 + rs))
-
-        return rsi.iloc[-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = np.float64(avg_gain) / avg_loss
+        return float(100 - (100 / (1 + rs)))
 
+    @_per_tick
     def calculate_bollinger_bands(
         self, symbol: str, period: int = 20, std_dev: float = 2.0
     ) -> Optional[Tuple[float, float, float]]:
         """Calculate Bollinger Bands (upper, middle, lower)"""
-        if symbol not in self.price_histories:
+        history = self.price_histories.get(symbol)
+        if history is None or len(history) < period:
             return None
 
-        df = self.price_histories[symbol].get_dataframe()
-        if len(df) < period:
-            return None
+        if NUMBA_AVAILABLE:
+            return bollinger_last(history.prices, period, std_dev)
 
-        sma = df["close"].rolling(window=period).mean().iloc[-1]
-        std = df["close"].rolling(window=period).std().iloc[-1]
+        closes = history.window(period)
+        sma = float(closes.mean())
+        std = float(closes.std(ddof=1))
 
         upper = sma + (std * std_dev)
         lower = sma - (std * std_dev)
@@ -201,19 +488,16 @@ class SignalEngine:
         Detect support and resistance levels using local min/max
         Returns (support, resistance)
         """
-        if symbol not in self.price_histories:
-            return 0.0, 0.0
-
-        df = self.price_histories[symbol].get_dataframe(lookback)
-        if len(df) < 10:
+        history = self.price_histories.get(symbol)
+        if history is None or min(len(history), lookback) < 10:
             return 0.0, 0.0
 
         # Use recent high/low as resistance/support
-        resistance = df["high"].max()
-        support = df["low"].min()
+        if lookback == SIGNAL_WINDOW:
+            return history.support, history.resistance
 
-        # Cache the levels
-        self.support_resistance_cache[symbol] = (support, resistance)
+        resistance = float(history.highs[-lookback:].max())
+        support = float(history.lows[-lookback:].min())
 
         return support, resistance
 
@@ -221,56 +505,179 @@ class SignalEngine:
         """
         Detect if current volume is significantly higher than average
         """
-        if symbol not in self.price_histories:
-            return False
-
-        df = self.price_histories[symbol].get_dataframe()
-        if len(df) < 20:
+        history = self.price_histories.get(symbol)
+        if history is None or len(history) < 20:
             return False
 
-        avg_volume = df["volume"].iloc[:-1].mean()
-        current_volume = df["volume"].iloc[-1]
+        current_volume = int(history.volumes[-1])
+        avg_volume = (history.volume_sum - current_volume) / (len(history) - 1)
 
         return current_volume > (avg_volume * threshold)
 
+    @_per_tick
     def calculate_volatility(self, symbol: str, period: int = 20) -> Optional[float]:
         """Calculate price volatility (standard deviation of returns)"""
-        if symbol not in self.price_histories:
+        history = self.price_histories.get(symbol)
+        if history is None or len(history) <= period:
             return None
 
-        df = self.price_histories[symbol].get_dataframe()
-        if len(df) < period:
-            return None
+        if NUMBA_AVAILABLE:
+            return volatility_last(history.prices, period)
 
-        returns = df["close"].pct_change()
-        volatility = returns.rolling(window=period).std().iloc[-1]
+        closes = history.window(period + 1)
+        returns = closes[1:] / closes[:-1] - 1
 
-        return volatility
+        return float(returns.std(ddof=1))
 
     def generate_signal(self, symbol: str, current_price: float) -> Optional[TradingSignal]:
         """
         Generate trading signal based on multiple indicators
         """
-        if symbol not in self.price_histories:
+        history = self.price_histories.get(symbol)
+        if history is None or len(history) < MIN_SIGNAL_HISTORY:
             return None
 
-        history = self.price_histories[symbol]
-        if len(history) < 30:  # Need minimum history
-            return None
+        cached = self._cached_signal(symbol, history, current_price)
+        if cached is not None:
+            return cached
 
-        indicators = {}
-        signals = []
-        reasons = []
+        if NUMBA_AVAILABLE:
+            # One fused pass over the last 50 bars instead of a pass per indicator
+            window = self._store_window(
+                symbol, history, signal_indicators(history.prices, history.highs, history.lows)
+            )
+        else:
+            window = (
+                self.calculate_sma(symbol, 20),
+                self.calculate_sma(symbol, 50),
+                float(history.prices[-21:-1].mean()),
+                self.calculate_volatility(symbol, 20),
+                *self.detect_support_resistance(symbol, SIGNAL_WINDOW),
+            )
+
+        return self._record_signal(
+            history, self._evaluate_signal(symbol, history, current_price, *window)
+        )
+
+    def generate_signals(self, current_prices: Dict[str, float]) -> Dict[str, TradingSignal]:
+        """
+        Generate signals for many symbols at once
 
-        # Calculate indicators
-        sma_20 = self.calculate_sma(symbol, 20)
-        sma_50 = self.calculate_sma(symbol, 50)
+        The last 50 bars of every symbol are stacked into one matrix so the window
+        indicators are computed in a single batch, across threads for large batches;
+        rules are then applied per symbol
+
+        Args:
+            current_prices: Current price per symbol
+
+        Returns:
+            Signal per symbol with enough history
+        """
+        signals = {}
+        ready = []
+        for symbol, current_price in current_prices.items():
+            history = self.price_histories.get(symbol)
+            if history is None or len(history) < MIN_SIGNAL_HISTORY:
+                continue
+            cached = self._cached_signal(symbol, history, current_price)
+            if cached is not None:
+                signals[symbol] = cached
+            else:
+                ready.append((symbol, history))
+        if not ready:
+            return signals
+
+        # Right-aligned rows; symbols with fewer than 50 bars are NaN-padded on the left
+        shape = (len(ready), SIGNAL_WINDOW)
+        closes = np.full(shape, np.nan)
+        highs = np.full(shape, np.nan)
+        lows = np.full(shape, np.nan)
+        lengths = np.empty(len(ready), dtype=np.int64)
+        for row, (_, history) in enumerate(ready):
+            k = min(len(history), SIGNAL_WINDOW)
+            closes[row, -k:] = history.prices[-k:]
+            highs[row, -k:] = history.highs[-k:]
+            lows[row, -k:] = history.lows[-k:]
+            lengths[row] = k
+
+        if NUMBA_AVAILABLE:
+            if len(ready) >= PARALLEL_SIGNAL_SYMBOLS:
+                windows = signal_indicators_batch_parallel(closes, highs, lows, lengths)
+            else:
+                windows = signal_indicators_batch(closes, highs, lows, lengths)
+        else:
+            tail = closes[:, -21:]
+            returns = tail[:, 1:] / tail[:, :-1] - 1
+            windows = np.column_stack((
+                closes[:, -20:].mean(axis=1),
+                closes.mean(axis=1),
+                tail[:, :-1].mean(axis=1),
+                returns.std(axis=1, ddof=1),
+                np.nanmin(lows, axis=1),
+                np.nanmax(highs, axis=1),
+            ))
+
+        for (symbol, history), window in zip(ready, windows.tolist()):
+            window = self._store_window(symbol, history, window)
+            signals[symbol] = self._record_signal(
+                history,
+                self._evaluate_signal(symbol, history, current_prices[symbol], *window),
+            )
+        return signals
+
+    def _cached_signal(
+        self, symbol: str, history: PriceHistory, current_price: float
+    ) -> Optional[TradingSignal]:
+        """The last signal for symbol if no bar was added and the price is unchanged since"""
+        cached = self._last_signal.get(symbol)
+        if cached is not None and cached[0] == history.bar_id and cached[1].price == current_price:
+            return cached[1]
+        return None
+
+    def _record_signal(self, history: PriceHistory, signal: TradingSignal) -> TradingSignal:
+        """Remember signal as current for its symbol until the next price update"""
+        self._last_signal[signal.symbol] = (history.bar_id, signal)
+        return signal
+
+    def _store_window(self, symbol: str, history: PriceHistory, window: Tuple) -> Tuple:
+        """
+        Record batch-computed window indicators so calculate_* calls on this tick
+        (screener, dashboard) reuse them; sma_50 becomes None below 50 bars
+        """
+        sma_20, sma_50, prev_sma_20, volatility, support, resistance = window
+        if len(history) < SIGNAL_WINDOW:
+            sma_50 = None
+        history.indicator_cache.update({
+            ("calculate_sma", 20): sma_20,
+            ("calculate_sma", 50): sma_50,
+            ("calculate_volatility", 20): volatility,
+        })
+        return sma_20, sma_50, prev_sma_20, volatility, support, resistance
+
+    def _evaluate_signal(
+        self,
+        symbol: str,
+        history: PriceHistory,
+        current_price: float,
+        sma_20: Optional[float],
+        sma_50: Optional[float],
+        prev_sma_20: float,
+        volatility: Optional[float],
+        support: float,
+        resistance: float,
+    ) -> TradingSignal:
+        """Apply the strategy rules to a symbol's indicators"""
+        # Votes per side, which rules fired (bit per rule) and their reasons
+        buy_count = 0
+        sell_count = 0
+        fired = 0
+        reasons: List[Optional[str]] = [None] * _RULE_COUNT
+
+        # EMAs, RSI and the volume average are kept up to date by PriceHistory
         ema_12 = self.calculate_ema(symbol, 12)
         ema_26 = self.calculate_ema(symbol, 26)
         rsi = self.calculate_rsi(symbol, 14)
-        volatility = self.calculate_volatility(symbol, 20)
         volume_surge = self.detect_volume_surge(symbol, 2.0)
-        support, resistance = self.detect_support_resistance(symbol, 50)
 
         indicators = {
             "sma_20": sma_20,
@@ -285,57 +692,62 @@ class SignalEngine:
         }
 
         # Strategy 1: Breakout Strategy
-        if settings.enable_breakout_strategy and resistance > 0:
+        if self._enable_breakout and resistance > 0:
             if current_price >= resistance * 0.998:  # Price breaking resistance
-                signals.append(SignalType.BUY)
-                reasons.append(f"Breakout above resistance {resistance:.2f}")
+                buy_count += 1
+                fired |= 1 << _BREAKOUT
+                reasons[_BREAKOUT] = f"Breakout above resistance {resistance:.2f}"
 
         # Strategy 2: Support/Resistance Strategy
-        if settings.enable_support_resistance_strategy and support > 0:
+        if self._enable_support_resistance and support > 0:
             if current_price <= support * 1.002:  # Price at support
-                signals.append(SignalType.BUY)
-                reasons.append(f"Price at support {support:.2f}")
+                buy_count += 1
+                fired |= 1 << _AT_SUPPORT
+                reasons[_AT_SUPPORT] = f"Price at support {support:.2f}"
             elif current_price <= support * 0.98:  # Price breaking support
-                signals.append(SignalType.SELL)
-                reasons.append(f"Price breaking support {support:.2f}")
+                sell_count += 1
+                fired |= 1 << _BREAKING_SUPPORT
+                reasons[_BREAKING_SUPPORT] = f"Price breaking support {support:.2f}"
 
         # Strategy 3: Moving Average Crossover
         if sma_20 and sma_50:
-            df = self.price_histories[symbol].get_dataframe()
-            if len(df) >= 2:
-                prev_sma_20 = df["close"].iloc[-21:-1].mean()
-                if prev_sma_20 <= sma_50 and sma_20 > sma_50:
-                    signals.append(SignalType.BUY)
-                    reasons.append("Golden Cross (SMA20 > SMA50)")
-                elif prev_sma_20 >= sma_50 and sma_20 < sma_50:
-                    signals.append(SignalType.SELL)
-                    reasons.append("Death Cross (SMA20 < SMA50)")
+            if prev_sma_20 <= sma_50 and sma_20 > sma_50:
+                buy_count += 1
+                fired |= 1 << _GOLDEN_CROSS
+                reasons[_GOLDEN_CROSS] = "Golden Cross (SMA20 > SMA50)"
+            elif prev_sma_20 >= sma_50 and sma_20 < sma_50:
+                sell_count += 1
+                fired |= 1 << _DEATH_CROSS
+                reasons[_DEATH_CROSS] = "Death Cross (SMA20 < SMA50)"
 
         # Strategy 4: RSI Strategy
         if rsi:
             if rsi < 30:
-                signals.append(SignalType.BUY)
-                reasons.append(f"RSI oversold ({rsi:.1f})")
+                buy_count += 1
+                fired |= 1 << _OVERSOLD
+                reasons[_OVERSOLD] = f"RSI oversold ({rsi:.1f})"
             elif rsi > 70:
-                signals.append(SignalType.SELL)
-                reasons.append(f"RSI overbought ({rsi:.1f})")
+                sell_count += 1
+                fired |= 1 << _OVERBOUGHT
+                reasons[_OVERBOUGHT] = f"RSI overbought ({rsi:.1f})"
 
         # Strategy 5: Volume Surge with Price Increase
         if volume_surge:
-            df = self.price_histories[symbol].get_dataframe()
-            price_change = (df["close"].iloc[-1] - df["close"].iloc[-2]) / df["close"].iloc[-2]
+            closes = history.prices
+            price_change = (closes[-1] - closes[-2]) / closes[-2]
             if price_change > 0.02:  # 2% increase
-                signals.append(SignalType.BUY)
-                reasons.append(f"Volume surge with {price_change*100:.1f}% price increase")
+                buy_count += 1
+                fired |= 1 << _VOLUME_SURGE
+                reasons[_VOLUME_SURGE] = f"Volume surge with {price_change*100:.1f}% price increase"
 
         # Strategy 6: Volatility-based Cutloss
-        if settings.enable_volatility_cutloss and volatility:
-            if volatility > settings.volatility_threshold:
-                signals.append(SignalType.CUTLOSS)
-                reasons.append(f"High volatility ({volatility*100:.2f}%)")
+        if self._enable_volatility_cutloss and volatility:
+            if volatility > self._volatility_threshold:
+                fired |= 1 << _HIGH_VOLATILITY
+                reasons[_HIGH_VOLATILITY] = f"High volatility ({volatility*100:.2f}%)"
 
         # Determine final signal
-        if not signals:
+        if not fired:
             return TradingSignal(
                 symbol=symbol,
                 signal_type=SignalType.HOLD,
@@ -345,53 +757,34 @@ class SignalEngine:
                 indicators=indicators,
             )
 
-        # Count signal types
-        buy_count = signals.count(SignalType.BUY)
-        sell_count = signals.count(SignalType.SELL)
-        cutloss_count = signals.count(SignalType.CUTLOSS)
-
         # Cutloss takes priority
-        if cutloss_count > 0:
+        if fired & _CUTLOSS_REASONS:
             return TradingSignal(
                 symbol=symbol,
                 signal_type=SignalType.CUTLOSS,
                 strength=SignalStrength.STRONG,
                 price=current_price,
-                reason=" | ".join([r for r in reasons if "volatility" in r.lower()]),
+                reason=_join_reasons(reasons, fired & _CUTLOSS_REASONS),
                 indicators=indicators,
             )
 
         # Determine signal based on majority
         if buy_count > sell_count:
-            strength = (
-                SignalStrength.STRONG
-                if buy_count >= 3
-                else SignalStrength.MODERATE
-                if buy_count >= 2
-                else SignalStrength.WEAK
-            )
             return TradingSignal(
                 symbol=symbol,
                 signal_type=SignalType.BUY,
-                strength=strength,
+                strength=_STRENGTH_BY_COUNT[min(buy_count, 3)],
                 price=current_price,
-                reason=" | ".join([r for r in reasons if any(x in r for x in ["Breakout", "support", "Cross", "oversold", "surge"])]),
+                reason=_join_reasons(reasons, fired & _BUY_REASONS),
                 indicators=indicators,
             )
         elif sell_count > buy_count:
-            strength = (
-                SignalStrength.STRONG
-                if sell_count >= 3
-                else SignalStrength.MODERATE
-                if sell_count >= 2
-                else SignalStrength.WEAK
-            )
             return TradingSignal(
                 symbol=symbol,
                 signal_type=SignalType.SELL,
-                strength=strength,
+                strength=_STRENGTH_BY_COUNT[min(sell_count, 3)],
                 price=current_price,
-                reason=" | ".join([r for r in reasons if any(x in r for x in ["breaking", "Cross", "overbought"])]),
+                reason=_join_reasons(reasons, fired & _SELL_REASONS),
                 indicators=indicators,
             )
         else:
@@ -5,7 +5,9 @@ Coordinates all components to execute automated trading strategies
 import time
 import signal
 import sys
-from typing import List, Set
+from collections import Counter, OrderedDict
+from queue import Empty, Full, Queue
+from typing import List
 from datetime import datetime, timedelta
 from threading import Thread, Event
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -18,6 +20,15 @@ from core.order_executor import order_executor, OrderSide, OrderType
 from core.risk_manager import risk_manager
 from utils.notifications import NotificationManager
 
+# Ticks waiting for the tick worker, all symbols in one queue. When full the oldest
+# tick is dropped whatever its symbol, so under overload any symbol can miss ticks
+# (and its indicator history a bar); drops are counted per symbol
+TICK_QUEUE_SIZE = 1024
+
+# How often all open positions are checked for stop loss, take profit and
+# trailing stop; a tick that crosses a stop or target is checked right away
+MONITOR_INTERVAL_SECONDS = 1
+
 
 class TradingBot:
     """
@@ -36,8 +47,18 @@ class TradingBot:
         self.scheduler = BackgroundScheduler()
         self.notification_manager = NotificationManager()
 
-        # Track processed signals to avoid duplicates
-        self.processed_signals: Set[str] = set()
+        # MQTT callbacks only enqueue ticks; the worker runs signals and orders
+        self._tick_queue: Queue = Queue(maxsize=TICK_QUEUE_SIZE)
+        self._tick_worker = Thread(target=self._process_tick_loop, name="tick-worker", daemon=True)
+        self.dropped_ticks = 0
+        self.dropped_ticks_by_symbol: Counter = Counter()
+        # Set by the scheduler; the tick worker runs the check so position state
+        # is only ever touched from that thread
+        self._monitor_due = Event()
+
+        # Track processed signals to avoid duplicates: signal ID -> minute processed,
+        # oldest first
+        self.processed_signals: "OrderedDict[str, int]" = OrderedDict()
 
         # DCA bot settings
         self.dca_enabled = settings.dca_enabled
@@ -52,6 +73,55 @@ class TradingBot:
     def _on_price_update(self, price_data: PriceData):
         """
         Callback when price data is received from MQTT
+        Hands the tick to the tick worker so slow order placement never stalls ingestion
+        """
+        try:
+            self._tick_queue.put_nowait(price_data)
+        except Full:
+            # Drop the oldest tick to make room
+            try:
+                dropped = self._tick_queue.get_nowait()
+            except Empty:
+                dropped = None
+            try:
+                self._tick_queue.put_nowait(price_data)
+            except Full:
+                dropped = price_data
+            if dropped is not None:
+                self._count_dropped_tick(dropped)
+
+    def _count_dropped_tick(self, price_data: PriceData):
+        """Record a tick lost to a full queue"""
+        self.dropped_ticks += 1
+        self.dropped_ticks_by_symbol[price_data.symbol] += 1
+        if self.dropped_ticks % 1000 == 1:
+            logger.warning(
+                f"Tick queue full, dropped {self.dropped_ticks} ticks so far "
+                f"(most for: {self.dropped_ticks_by_symbol.most_common(3)})"
+            )
+
+    def _process_tick_loop(self):
+        """Tick worker: process queued ticks in arrival order until the bot stops"""
+        while not self.stop_event.is_set():
+            if self._monitor_due.is_set():
+                self._monitor_due.clear()
+                self._monitor_positions()
+            try:
+                price_data = self._tick_queue.get(timeout=0.5)
+            except Empty:
+                continue
+            self._process_tick(price_data)
+
+    def _monitor_positions(self):
+        """Scheduled check of all open positions"""
+        try:
+            risk_manager.monitor_positions()
+        except Exception as e:
+            logger.error(f"Error monitoring positions: {e}")
+
+    def _process_tick(self, price_data: PriceData):
+        """
+        Process one price tick
         This is the main event loop of the bot
         """
         try:
@@ -66,11 +136,10 @@ class TradingBot:
                 low=price_data.low,
             )
 
-            # Update risk manager with current price
-            risk_manager.update_position_price(symbol, price_data.price)
-
-            # Monitor positions for stop-loss and take-profit
-            risk_manager.monitor_positions()
+            # Update risk manager with current price; act at once if it crossed
+            # the stop or target instead of waiting for the scheduled check
+            if risk_manager.update_position_price(symbol, price_data.price):
+                risk_manager.check_position(symbol)
 
             # Generate trading signal
             signal = signal_engine.generate_signal(symbol, price_data.price)
@@ -86,7 +155,8 @@ class TradingBot:
         Process a trading signal and execute orders if appropriate
         """
         # Create unique signal ID to avoid duplicate processing
-        signal_id = f"{signal.symbol}_{signal.signal_type.value}_{int(time.time()/60)}"
+        current_minute = int(time.time() / 60)
+        signal_id = f"{signal.symbol}_{signal.signal_type.value}_{current_minute}"
 
         if signal_id in self.processed_signals:
             return
@@ -111,13 +181,12 @@ class TradingBot:
             self._execute_cutloss(signal, price_data)
 
         # Mark signal as processed
-        self.processed_signals.add(signal_id)
+        processed = self.processed_signals
+        processed[signal_id] = current_minute
 
         # Clean up old signals (keep only last hour)
-        current_time = int(time.time() / 60)
-        self.processed_signals = {
-            sid for sid in self.processed_signals if int(sid.split("_")[-1]) > current_time - 60
-        }
+        while next(iter(processed.values())) <= current_minute - 60:
+            processed.popitem(last=False)
 
     def _execute_buy(self, signal, price_data: PriceData):
         """
@@ -359,12 +428,19 @@ class TradingBot:
         logger.info("Starting Trading Bot...")
         logger.info("=" * 60)
 
+        # Compile indicator kernels now rather than on the first price update
+        logger.info("Preparing signal engine...")
+        signal_engine.warm_up()
+
         # Start price stream
         logger.info("Starting price stream manager...")
         if not price_stream_manager.start():
             logger.error("Failed to start price stream manager")
             return False
 
+        # Start processing ticks before they start arriving
+        self._tick_worker.start()
+
         # Register price callback
         price_stream_manager.add_callback(self._on_price_update)
 
@@ -378,6 +454,14 @@ class TradingBot:
             price_stream_manager.subscribe(self.dca_symbols)
 
         # Start scheduler for periodic jobs
+        self.scheduler.add_job(
+            self._monitor_due.set,
+            "interval",
+            seconds=MONITOR_INTERVAL_SECONDS,
+            id="monitor_positions",
+            max_instances=1,
+            coalesce=True,
+        )
         self.scheduler.add_job(
             self._portfolio_summary_job, "interval", minutes=15, id="portfolio_summary"
         )
@@ -426,6 +510,10 @@ class TradingBot:
         # Stop price stream
         price_stream_manager.stop()
 
+        # Let the tick worker finish the tick in hand
+        if self._tick_worker.is_alive():
+            self._tick_worker.join(timeout=5)
+
         # Send shutdown notification
         summary = risk_manager.get_portfolio_summary()
         self.notification_manager.send_notification(
@@ -453,11 +541,10 @@ class TradingBot:
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
 
-        # Keep running
+        # Keep running; stop() sets stop_event, so block on it rather than poll
         logger.info("Trading Bot is running. Press Ctrl+C to stop.")
         try:
-            while self.is_running:
-                time.sleep(1)
+            self.stop_event.wait()
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
             self.stop()
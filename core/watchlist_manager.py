@@ -2,15 +2,29 @@
 Watchlist Management System
 Manage multiple watchlists, add/remove symbols, import/export
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 from datetime import datetime
 from dataclasses import dataclass, asdict
-import json
+from threading import Event, Lock, Thread
+import atexit
 import csv
+import os
+import shutil
+import time
+import uuid
 from pathlib import Path
+import orjson
 from loguru import logger
 from utils.cache import cache_manager
 
+# Mutations only mark the watchlists dirty; the background writer waits this long
+# after the first one so a burst of changes is saved once
+SAVE_DEBOUNCE_SECONDS = 0.2
+
+# Changes are appended to a journal next to the snapshot file; once it grows past
+# this size the background writer folds it into a new snapshot
+JOURNAL_COMPACT_BYTES = 1 << 20
+
 
 @dataclass
 class Watchlist:
@@ -29,13 +43,27 @@ class Watchlist:
             "id": self.id,
             "name": self.name,
             "description": self.description,
-            "symbols": self.symbols,
+            "symbols": list(self.symbols),
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
             "is_default": self.is_default,
             "color": self.color,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Watchlist":
+        """Rebuild a watchlist from to_dict() output"""
+        return cls(
+            id=data['id'],
+            name=data['name'],
+            description=data['description'],
+            symbols=data['symbols'],
+            created_at=datetime.fromisoformat(data['created_at']),
+            updated_at=datetime.fromisoformat(data['updated_at']),
+            is_default=data.get('is_default', False),
+            color=data.get('color', '#3b82f6'),
+        )
+
 
 class WatchlistManager:
     """
@@ -48,56 +76,236 @@ class WatchlistManager:
     - Import/Export (JSON, CSV)
     - Predefined templates
     - Symbol validation
-    - Auto-save to cache/database
+    - Auto-save to cache/database (coalesced on a background thread)
     """
 
     def __init__(self, storage_path: str = "data/watchlists.json"):
         self.storage_path = Path(storage_path)
         self.watchlists: Dict[str, Watchlist] = {}
+
+        # Symbol -> IDs of the watchlists holding it, and the sorted symbol list,
+        # rebuilt lazily after the set of symbols changes
+        self._symbol_to_watchlists: Dict[str, Set[str]] = {}
+        self._unique_symbols: Optional[List[str]] = None
+
+        # Append-only change log; during compaction it is moved aside to
+        # _compacting_path until the new snapshot is in place
+        self.journal_path = self.storage_path.with_suffix(".journal")
+        self._compacting_path = self.storage_path.with_suffix(".journal.compacting")
+        self._journal_file = None
+        self._journal_bytes = 0
+        self._journal_lock = Lock()
+
+        # Unsaved changes flag, and a lock so the writer and flush() never save at once
+        self._dirty = Event()
+        self._save_lock = Lock()
+        self._closed = Event()
+        self._writer = Thread(target=self._writer_loop, name="watchlist-writer", daemon=True)
+        self._writer.start()
+
         self._load_watchlists()
         self._create_default_templates()
 
     def _load_watchlists(self):
-        """Load watchlists from storage"""
-        if self.storage_path.exists():
-            try:
-                with open(self.storage_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+        """Load watchlists from storage: the snapshot, then any journaled changes"""
+        try:
+            if self.storage_path.exists():
+                data = orjson.loads(self.storage_path.read_bytes())
 
                 for wl_data in data:
-                    wl = Watchlist(
-                        id=wl_data['id'],
-                        name=wl_data['name'],
-                        description=wl_data['description'],
-                        symbols=wl_data['symbols'],
-                        created_at=datetime.fromisoformat(wl_data['created_at']),
-                        updated_at=datetime.fromisoformat(wl_data['updated_at']),
-                        is_default=wl_data.get('is_default', False),
-                        color=wl_data.get('color', '#3b82f6'),
-                    )
+                    wl = Watchlist.from_dict(wl_data)
                     self.watchlists[wl.id] = wl
 
-                logger.info(f"Loaded {len(self.watchlists)} watchlists")
-            except Exception as e:
-                logger.error(f"Error loading watchlists: {e}")
+            for path in (self._compacting_path, self.journal_path):
+                if path.exists():
+                    self._journal_bytes += path.stat().st_size
+                    self._replay_journal(path)
 
-    def _save_watchlists(self):
-        """Save watchlists to storage"""
-        try:
-            self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Loaded {len(self.watchlists)} watchlists")
 
-            data = [wl.to_dict() for wl in self.watchlists.values()]
+            for watchlist in self.watchlists.values():
+                self._index_watchlist(watchlist)
 
-            with open(self.storage_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # Start from an empty journal
+            self._save_pending(compact=True)
+        except Exception as e:
+            logger.error(f"Error loading watchlists: {e}")
+
+    def _replay_journal(self, path: Path):
+        """Apply the changes recorded in a journal file, in order"""
+        with open(path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # A write cut short by a crash
+                    logger.warning(f"Skipping unreadable entry in {path}")
+                    continue
+
+                op = entry["op"]
+                watchlist_id = entry["wl"]
+                if op == "put":
+                    self.watchlists[watchlist_id] = Watchlist.from_dict(entry["data"])
+                elif op == "delete":
+                    self.watchlists.pop(watchlist_id, None)
+                elif watchlist_id in self.watchlists:
+                    # Symbol changes are idempotent, so replaying ones the snapshot
+                    # already contains is harmless
+                    watchlist = self.watchlists[watchlist_id]
+                    symbol = entry["symbol"]
+                    if op == "add" and symbol not in watchlist.symbols:
+                        watchlist.symbols.append(symbol)
+                    elif op == "remove" and symbol in watchlist.symbols:
+                        watchlist.symbols.remove(symbol)
+                    watchlist.updated_at = datetime.fromisoformat(entry["at"])
+
+    def _index_symbol(self, watchlist_id: str, symbol: str):
+        """Note that a watchlist holds symbol"""
+        holders = self._symbol_to_watchlists.get(symbol)
+        if holders is None:
+            self._symbol_to_watchlists[symbol] = {watchlist_id}
+            self._unique_symbols = None
+        else:
+            holders.add(watchlist_id)
+
+    def _unindex_symbol(self, watchlist_id: str, symbol: str):
+        """Note that a watchlist no longer holds symbol"""
+        holders = self._symbol_to_watchlists.get(symbol)
+        if holders is None:
+            return
+        holders.discard(watchlist_id)
+        if not holders:
+            del self._symbol_to_watchlists[symbol]
+            self._unique_symbols = None
+
+    def _index_watchlist(self, watchlist: Watchlist):
+        """Index every symbol of a watchlist"""
+        for symbol in watchlist.symbols:
+            self._index_symbol(watchlist.id, symbol)
+
+    def _unindex_watchlist(self, watchlist: Watchlist):
+        """Drop every symbol of a watchlist from the index"""
+        for symbol in watchlist.symbols:
+            self._unindex_symbol(watchlist.id, symbol)
+
+    def _record(self, op: str, watchlist_id: str, **fields):
+        """
+        Append one change to the journal and schedule a background save
+        Call after the change has been applied in memory
+        """
+        line = orjson.dumps(
+            {"op": op, "wl": watchlist_id, **fields}, option=orjson.OPT_APPEND_NEWLINE
+        )
+        with self._journal_lock:
+            if self._journal_file is None:
+                self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                self._journal_file = open(self.journal_path, 'ab', buffering=0)
+            self._journal_file.write(line)
+            self._journal_bytes += len(line)
+        self._dirty.set()
+
+    def _record_put(self, watchlist: Watchlist):
+        """Journal a watchlist's full state"""
+        # orjson encodes the dataclass (and its datetimes) in the same format as to_dict()
+        self._record("put", watchlist.id, data=watchlist)
+
+    def _record_symbol(self, op: str, watchlist: Watchlist, symbol: str):
+        """Journal a symbol added to or removed from a watchlist"""
+        self._record(op, watchlist.id, symbol=symbol, at=watchlist.updated_at)
+
+    def _writer_loop(self):
+        """Save in the background once the first pending change has settled, until closed"""
+        while True:
+            self._dirty.wait()
+            # close() wakes the writer through _dirty and interrupts the debounce
+            if self._closed.is_set() or self._closed.wait(SAVE_DEBOUNCE_SECONDS):
+                return
+            self._save_pending(compact=self._journal_bytes >= JOURNAL_COMPACT_BYTES)
+
+    def flush(self):
+        """Fold journaled changes into the snapshot now"""
+        self._save_pending(compact=True)
+
+    def close(self):
+        """
+        Stop the background writer and fold all changes into the snapshot
+        The manager must not be changed afterwards
+        """
+        if self._closed.is_set():
+            return
+        was_dirty = self._dirty.is_set()
+        self._closed.set()
+        self._dirty.set()
+        self._writer.join()
+        if not was_dirty:
+            # Only set to wake the writer; journaled changes are compacted regardless
+            self._dirty.clear()
+
+        self.flush()
+        with self._journal_lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+
+    def _save_pending(self, compact: bool):
+        """Save if there are unsaved changes, or journal entries to compact"""
+        with self._save_lock:
+            compact = compact and self._journal_bytes > 0
+            if not self._dirty.is_set() and not compact:
+                return
+            self._dirty.clear()
+            self._save_watchlists(compact)
+
+    def _save_watchlists(self, compact: bool = False):
+        """
+        Refresh the Redis copy of the watchlists; with compact, also write a new
+        snapshot file and drop the journal entries it includes
+        """
+        try:
+            if compact:
+                payload = self._compact()
+            else:
+                payload = self._encode_watchlists()
 
             # Also cache in Redis for fast access
-            cache_manager.set("watchlists:all", data, ttl=3600)
+            cache_manager.set_encoded("watchlists:all", payload, ttl=3600)
 
             logger.info(f"Saved {len(self.watchlists)} watchlists")
         except Exception as e:
             logger.error(f"Error saving watchlists: {e}")
 
+    def _encode_watchlists(self) -> bytes:
+        """All watchlists as a JSON array"""
+        # Runs on the writer thread: list() snapshots the dict without racing
+        # mutations, and orjson encodes each dataclass without releasing the GIL
+        return orjson.dumps(list(self.watchlists.values()))
+
+    def _compact(self) -> bytes:
+        """Write a full snapshot atomically and empty the journal; returns the snapshot"""
+        # Snapshot and journal hand-off happen under the journal lock, so every
+        # change is either in the snapshot or in the fresh journal
+        with self._journal_lock:
+            payload = self._encode_watchlists()
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+            if self.journal_path.exists():
+                if self._compacting_path.exists():
+                    # An earlier snapshot write failed; keep its entries as well
+                    with open(self._compacting_path, 'ab') as dst, open(self.journal_path, 'rb') as src:
+                        shutil.copyfileobj(src, dst)
+                    self.journal_path.unlink()
+                else:
+                    os.replace(self.journal_path, self._compacting_path)
+            self._journal_bytes = 0
+
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.storage_path.with_suffix(".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, self.storage_path)
+        self._compacting_path.unlink(missing_ok=True)
+        return payload
+
     def create_watchlist(
         self,
         name: str,
@@ -117,8 +325,6 @@ class WatchlistManager:
         Returns:
             Created Watchlist object
         """
-        import uuid
-
         watchlist_id = str(uuid.uuid4())
         symbols = symbols or []
 
@@ -136,7 +342,8 @@ class WatchlistManager:
         )
 
         self.watchlists[watchlist_id] = watchlist
-        self._save_watchlists()
+        self._index_watchlist(watchlist)
+        self._record_put(watchlist)
 
         logger.info(f"Created watchlist: {name} with {len(symbols)} symbols")
         return watchlist
@@ -161,12 +368,14 @@ class WatchlistManager:
         if description is not None:
             watchlist.description = description
         if symbols is not None:
+            self._unindex_watchlist(watchlist)
             watchlist.symbols = [s.upper().strip() for s in symbols if s.strip()]
+            self._index_watchlist(watchlist)
         if color:
             watchlist.color = color
 
         watchlist.updated_at = datetime.now()
-        self._save_watchlists()
+        self._record_put(watchlist)
 
         logger.info(f"Updated watchlist: {watchlist.name}")
         return watchlist
@@ -183,7 +392,8 @@ class WatchlistManager:
             return False
 
         del self.watchlists[watchlist_id]
-        self._save_watchlists()
+        self._unindex_watchlist(watchlist)
+        self._record("delete", watchlist_id)
 
         logger.info(f"Deleted watchlist: {watchlist.name}")
         return True
@@ -202,7 +412,8 @@ class WatchlistManager:
 
         watchlist.symbols.append(symbol)
         watchlist.updated_at = datetime.now()
-        self._save_watchlists()
+        self._index_symbol(watchlist_id, symbol)
+        self._record_symbol("add", watchlist, symbol)
 
         logger.info(f"Added {symbol} to {watchlist.name}")
         return True
@@ -220,7 +431,10 @@ class WatchlistManager:
 
         watchlist.symbols.remove(symbol)
         watchlist.updated_at = datetime.now()
-        self._save_watchlists()
+        # Lists created without add_symbol may hold a symbol more than once
+        if symbol not in watchlist.symbols:
+            self._unindex_symbol(watchlist_id, symbol)
+        self._record_symbol("remove", watchlist, symbol)
 
         logger.info(f"Removed {symbol} from {watchlist.name}")
         return True
@@ -248,8 +462,8 @@ class WatchlistManager:
         try:
             watchlist = self.watchlists[watchlist_id]
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(watchlist.to_dict(), f, ensure_ascii=False, indent=2)
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(watchlist, option=orjson.OPT_INDENT_2))
 
             logger.info(f"Exported {watchlist.name} to {filepath}")
             return True
@@ -280,11 +494,10 @@ class WatchlistManager:
     def import_from_json(self, filepath: str) -> Optional[Watchlist]:
         """Import watchlist from JSON file"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(filepath, 'rb') as f:
+                data = orjson.loads(f.read())
 
             # Generate new ID to avoid conflicts
-            import uuid
             watchlist_id = str(uuid.uuid4())
 
             watchlist = Watchlist(
@@ -298,7 +511,8 @@ class WatchlistManager:
             )
 
             self.watchlists[watchlist_id] = watchlist
-            self._save_watchlists()
+            self._index_watchlist(watchlist)
+            self._record_put(watchlist)
 
             logger.info(f"Imported watchlist: {watchlist.name}")
             return watchlist
@@ -309,14 +523,11 @@ class WatchlistManager:
     def import_from_csv(self, filepath: str, name: str, description: str = "") -> Optional[Watchlist]:
         """Import symbols from CSV file and create watchlist"""
         try:
-            symbols = []
-
-            with open(filepath, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                next(reader, None)  # Skip header
-                for row in reader:
-                    if row:
-                        symbols.append(row[0].strip().upper())
+            # Symbols are the first column: split lines directly rather than run
+            # csv.reader over every row
+            lines = Path(filepath).read_text(encoding='utf-8').splitlines()[1:]  # Skip header
+            symbols = [line.partition(',')[0].strip().strip('"').upper() for line in lines]
+            symbols = [symbol for symbol in symbols if symbol]
 
             return self.create_watchlist(name, description, symbols)
         except Exception as e:
@@ -382,31 +593,31 @@ class WatchlistManager:
         if self.watchlists:
             vn30_id = list(self.watchlists.keys())[0]
             self.watchlists[vn30_id].is_default = True
+            self._record_put(self.watchlists[vn30_id])
 
-        self._save_watchlists()
         logger.info("Created default watchlist templates")
 
     def search_symbols(self, query: str) -> List[str]:
         """Search for symbols across all watchlists"""
         query = query.upper()
-        found = set()
-
-        for watchlist in self.watchlists.values():
-            for symbol in watchlist.symbols:
-                if query in symbol:
-                    found.add(symbol)
-
-        return sorted(list(found))
+        return [symbol for symbol in self._sorted_symbols() if query in symbol]
 
     def get_all_unique_symbols(self) -> List[str]:
         """Get all unique symbols across all watchlists"""
-        all_symbols = set()
+        return list(self._sorted_symbols())
 
-        for watchlist in self.watchlists.values():
-            all_symbols.update(watchlist.symbols)
+    def get_watchlists_for_symbol(self, symbol: str) -> List[Watchlist]:
+        """Get the watchlists that contain a symbol"""
+        holders = self._symbol_to_watchlists.get(symbol.upper().strip(), ())
+        return [self.watchlists[watchlist_id] for watchlist_id in holders]
 
-        return sorted(list(all_symbols))
+    def _sorted_symbols(self) -> List[str]:
+        """Sorted unique symbols, cached until a symbol is first added or last removed"""
+        if self._unique_symbols is None:
+            self._unique_symbols = sorted(self._symbol_to_watchlists)
+        return self._unique_symbols
 
 
-# Global instance
+# Global instance; saved on interpreter exit
 watchlist_manager = WatchlistManager()
+atexit.register(watchlist_manager.close)
@@ -256,18 +256,27 @@ async def get_watchlist():
     # Example watchlist symbols
     watchlist_symbols = ["VCB", "VHM", "VIC", "FPT", "HPG"]
 
-    watchlist = []
+    latest = {}
     for symbol in watchlist_symbols:
         price_data = price_stream_manager.get_latest_price(symbol)
         if price_data:
-            signal = signal_engine.generate_signal(symbol, price_data.price)
-            watchlist.append({
-                "symbol": symbol,
-                "price": price_data.price,
-                "change_percent": price_data.change_percent,
-                "volume": price_data.volume,
-                "signal": signal.to_dict() if signal else None,
-            })
+            latest[symbol] = price_data
+
+    # One batch over all symbols instead of a generate_signal call each
+    signals = signal_engine.generate_signals(
+        {symbol: price_data.price for symbol, price_data in latest.items()}
+    )
+
+    watchlist = []
+    for symbol, price_data in latest.items():
+        signal = signals.get(symbol)
+        watchlist.append({
+            "symbol": symbol,
+            "price": price_data.price,
+            "change_percent": price_data.change_percent,
+            "volume": price_data.volume,
+            "signal": signal.to_dict() if signal else None,
+        })
 
     return watchlist
 
@@ -340,7 +349,7 @@ async def websocket_market_data(websocket: WebSocket):
 
                     # Send portfolio update
                     if risk_manager.positions:
-                        summary = risk_manager.get_portfolio_summary()
+                        summary = risk_manager.get_portfolio_summary(include_positions=True)
                         await manager.send_personal_message(
                             {"type": "portfolio_update", "data": summary},
                             websocket,
@@ -370,6 +379,7 @@ async def websocket_market_data(websocket: WebSocket):
 async def startup_event():
     """Initialize services on startup"""
     logger.info("Starting Dashboard API...")
+    signal_engine.warm_up()
     # Price stream will be started by the main trading bot
     # This is just the API layer
 
@@ -10,6 +10,7 @@ from loguru import logger
 
 from utils.config import settings
 from core.trading_bot import TradingBot
+from utils.event_loop import install_event_loop
 
 
 def parse_arguments():
@@ -120,6 +121,7 @@ def get_vn30_symbols():
 def main():
     """Main entry point"""
     args = parse_arguments()
+    install_event_loop()
 
     # Determine symbols to trade
     if args.vn30:
@@ -20,6 +20,7 @@ from screener.filters.technical_indicators import RSIExtremeFilter, MovingAverag
 from portfolio.rebalancer import portfolio_rebalancer, AllocationTarget
 from alerts.alert_system import alert_system, AlertChannel, PortfolioAlert
 from backtest.data.tick_recorder import tick_recorder
+from utils.event_loop import install_event_loop
 
 
 class DNSEInsightSystem:
@@ -214,6 +215,8 @@ class DNSEInsightSystem:
 
 def main():
     """Main entry point"""
+    install_event_loop()
+
     # Define symbols to trade/monitor
     symbols = [
         "VCB", "VHM", "VIC", "FPT", "HPG",
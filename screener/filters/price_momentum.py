@@ -60,12 +60,11 @@ class NewHighLowFilter(BaseFilter):
         if not history or len(history) < min(50, self.period):
             return None
 
-        df = history.get_dataframe()
         current_price = price_data.price
 
         # Get high/low over period
-        period_high = df["high"].max()
-        period_low = df["low"].min()
+        period_high = history.highs.max()
+        period_low = history.lows.min()
 
         # Check for new high
         if current_price >= period_high * 0.99:  # Within 1% of high
@@ -84,8 +84,7 @@ class MovingAverageCrossFilter(BaseFilter):
         if not history or len(history) < 21:
             return None
 
-        df = history.get_dataframe()
-        prev_sma_20 = df["close"].iloc[-21:-1].mean()
+        prev_sma_20 = history.prices[-21:-1].mean()
 
         # Golden Cross
         if prev_sma_20 <= sma_50 and sma_20 > sma_50:
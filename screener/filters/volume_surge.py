@@ -34,9 +34,9 @@ class VolumeSurgeFilter(BaseFilter):
         if not history or len(history) < 20:
             return None
 
-        df = history.get_dataframe()
-        avg_volume = df["volume"].iloc[:-1].mean()
-        current_volume = df["volume"].iloc[-1]
+        volumes = history.volumes
+        avg_volume = volumes[:-1].mean()
+        current_volume = volumes[-1]
         multiplier = current_volume / avg_volume if avg_volume > 0 else 0
 
         message = (
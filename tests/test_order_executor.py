@@ -0,0 +1,86 @@
+"""
+Unit tests for Order Executor
+"""
+import time
+
+import httpx
+import pytest
+from core.order_executor import OrderExecutor, OrderSide, OrderStatus, OrderStore
+
+
+class TestOrderExecutor:
+    """Test OrderExecutor class"""
+
+    @pytest.fixture
+    def executor(self, tmp_path):
+        """Create a live-mode executor with a scratch order store"""
+        executor = OrderExecutor()
+        executor.paper_mode = False
+        executor.orders = OrderStore(str(tmp_path / "orders.db"))
+        return executor
+
+    def test_batch_records_orders_around_failed_request(self, executor):
+        """Test a failed request rejects its order without dropping the others"""
+        responses = {
+            "VCB": {"success": True, "orderId": "1"},
+            "FPT": None,  # Request failed
+            "HPG": {"success": True, "orderId": "3"},
+        }
+
+        async def fake_request(client, method, endpoint, data=None):
+            for symbol, response in responses.items():
+                if symbol.encode() in data:
+                    return response
+
+        executor._arequest = fake_request
+
+        placed = executor.place_orders(
+            [(symbol, OrderSide.BUY, 100, 10.0) for symbol in responses]
+        )
+
+        assert placed[1] is None
+        assert [order.order_id for order in (placed[0], placed[2])] == ["1", "3"]
+        assert executor.orders.get("1").status == OrderStatus.PENDING
+        assert executor.orders.get("3").status == OrderStatus.PENDING
+
+    def test_batch_records_orders_around_non_json_reply(self, executor, monkeypatch):
+        """Test a 2xx reply that is not JSON rejects its order without dropping the others"""
+
+        def handler(request):
+            if b'"FPT"' in request.content:
+                return httpx.Response(200, text="<html>maintenance</html>")
+            order_id = "1" if b'"VCB"' in request.content else "3"
+            return httpx.Response(200, json={"success": True, "orderId": order_id})
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs),
+        )
+
+        placed = executor.place_orders(
+            [(symbol, OrderSide.BUY, 100, 10.0) for symbol in ("VCB", "FPT", "HPG")]
+        )
+
+        assert placed[1] is None
+        assert [order.order_id for order in (placed[0], placed[2])] == ["1", "3"]
+        assert executor.orders.get("1").status == OrderStatus.PENDING
+        assert executor.orders.get("3").status == OrderStatus.PENDING
+
+
+    def test_paper_history_is_per_session_and_recent(self, monkeypatch):
+        """Test paper order history holds only this session's orders within days"""
+        monkeypatch.setattr("core.order_executor.settings.trading_mode", "paper")
+        executor = OrderExecutor()
+        old = executor.place_order("VCB", OrderSide.BUY, 100, 10.0)
+        recent = executor.place_order("VCB", OrderSide.BUY, 100, 10.0)
+        old.created_at_ns = time.time_ns() - 10 * 86_400 * 1_000_000_000
+        executor.orders.put(old)
+
+        assert executor.get_order_history("VCB", days=7) == [recent]
+        assert OrderExecutor().get_order_history() == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,31 @@
+"""
+Unit tests for Price Stream Manager
+"""
+from datetime import datetime
+
+import pytest
+from core.price_stream import PriceStreamManager
+
+
+class TestPriceStreamManager:
+    """Test PriceStreamManager tick storage"""
+
+    def test_malformed_tick_keeps_previous_row(self):
+        """Test a tick with a bad field neither corrupts nor locks its row"""
+        manager = PriceStreamManager()
+        timestamp = datetime(2024, 1, 2, 9, 15)
+        manager._store_tick({"symbol": "VCB", "price": 70.0, "volume": 1000}, timestamp)
+
+        with pytest.raises(TypeError):
+            manager._store_tick(
+                {"symbol": "VCB", "price": 71.0, "volume": None}, datetime.now()
+            )
+
+        latest = manager.get_latest_price("VCB")
+        assert latest.price == 70.0
+        assert latest.volume == 1000
+        assert latest.timestamp == timestamp
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
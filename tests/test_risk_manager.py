@@ -109,6 +109,16 @@ class TestRiskManager:
         assert position.pnl > 0
         assert position.pnl_percent > 0
 
+    def test_update_position_price_reports_stop_crossing(self, risk_manager):
+        """Test update_position_price flags a price at or through the stop"""
+        risk_manager.open_position(
+            symbol="VCB", quantity=1000, entry_price=100.0, stop_loss_price=97.0
+        )
+
+        assert risk_manager.update_position_price("VCB", 99.0) is False
+        assert risk_manager.update_position_price("VCB", 96.5) is True
+        assert risk_manager.update_position_price("VHM", 50.0) is False
+
     def test_trailing_stop(self, risk_manager):
         """Test trailing stop loss"""
         risk_manager.open_position(
@@ -142,6 +152,28 @@ class TestRiskManager:
         assert "num_positions" in summary
         assert summary["num_positions"] == 2
 
+    def test_portfolio_totals_track_updates(self, risk_manager):
+        """Test running P&L and position value follow price updates and closes"""
+        risk_manager.open_position(
+            symbol="VCB", quantity=1000, entry_price=100.0, stop_loss_price=97.0
+        )
+        risk_manager.open_position(
+            symbol="VHM", quantity=500, entry_price=200.0, stop_loss_price=194.0
+        )
+        risk_manager.update_position_price("VCB", 105.0)
+        risk_manager.update_position_price("VHM", 190.0)
+
+        summary = risk_manager.get_portfolio_summary(include_positions=True)
+        assert summary["total_pnl"] == pytest.approx(5000.0 - 5000.0)
+        assert summary["total_position_value"] == pytest.approx(105_000.0 + 95_000.0)
+        assert len(summary["positions"]) == 2
+
+        risk_manager.close_position("VCB", 106.0)
+        summary = risk_manager.get_portfolio_summary()
+        assert summary["total_pnl"] == pytest.approx(-5000.0)
+        assert summary["total_position_value"] == pytest.approx(95_000.0)
+        assert "positions" not in summary
+
 
 class TestPosition:
     """Test Position class"""
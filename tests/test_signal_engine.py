@@ -1,8 +1,9 @@
 """
 Unit tests for Signal Engine
 """
+import time
+
 import pytest
-from datetime import datetime
 from core.signal_engine import (
     SignalEngine,
     SignalType,
@@ -19,7 +20,7 @@ class TestPriceHistory:
         history = PriceHistory("VCB", max_size=100)
 
         history.add(
-            price=100.0, volume=1000, high=101.0, low=99.0, timestamp=datetime.now()
+            price=100.0, volume=1000, high=101.0, low=99.0, ts_ns=time.time_ns()
         )
 
         assert len(history) == 1
@@ -36,12 +37,34 @@ class TestPriceHistory:
                 volume=1000,
                 high=101.0,
                 low=99.0,
-                timestamp=datetime.now(),
+                ts_ns=time.time_ns(),
             )
 
         assert len(history) == 3
         assert history.prices[0] == 102.0  # Oldest entry after rotation
 
+    def test_window_after_wraparound(self):
+        """Test the window stays in order once the buffer has been compacted"""
+        history = PriceHistory("VCB", max_size=4)
+
+        for i in range(11):
+            history.add(price=100.0 + i, volume=1000 + i, high=101.0, low=99.0)
+
+        assert len(history) == 4
+        assert list(history.prices) == [107.0, 108.0, 109.0, 110.0]
+        assert list(history.volumes) == [1007, 1008, 1009, 1010]
+        assert list(history.window(2)) == [109.0, 110.0]
+
+    def test_support_resistance_expire(self):
+        """Test support/resistance drop levels that leave the window"""
+        history = PriceHistory("VCB", max_size=3)
+
+        for high, low in [(110.0, 90.0), (105.0, 95.0), (104.0, 96.0), (103.0, 97.0)]:
+            history.add(price=100.0, volume=1000, high=high, low=low)
+
+        assert history.resistance == 105.0
+        assert history.support == 95.0
+
     def test_get_dataframe(self):
         """Test getting DataFrame"""
         history = PriceHistory("VCB", max_size=100)
@@ -52,7 +75,7 @@ class TestPriceHistory:
                 volume=1000,
                 high=101.0,
                 low=99.0,
-                timestamp=datetime.now(),
+                ts_ns=time.time_ns(),
             )
 
         df = history.get_dataframe()
@@ -144,6 +167,16 @@ class TestSignalEngine:
         assert isinstance(signal.strength, SignalStrength)
         assert signal.price == 100.0
 
+    def test_generate_signal_reused_until_update(self, engine_with_history):
+        """Test an unchanged symbol and price return the previous signal"""
+        signal = engine_with_history.generate_signal("VCB", 100.0)
+
+        assert engine_with_history.generate_signal("VCB", 100.0) is signal
+        assert engine_with_history.generate_signal("VCB", 101.0) is not signal
+
+        engine_with_history.update_price("VCB", 101.0, 1000, 102.0, 100.0)
+        assert engine_with_history.generate_signal("VCB", 101.0).price == 101.0
+
     def test_signal_indicators(self, engine_with_history):
         """Test that signal contains indicators"""
         signal = engine_with_history.generate_signal("VCB", 100.0)
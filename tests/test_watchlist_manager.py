@@ -0,0 +1,109 @@
+"""
+Unit tests for Watchlist Manager
+"""
+import pytest
+from core.watchlist_manager import WatchlistManager
+
+
+class TestWatchlistPersistence:
+    """Test snapshot + journal persistence"""
+
+    @pytest.fixture
+    def storage_path(self, tmp_path):
+        """Scratch snapshot path"""
+        return tmp_path / "watchlists.json"
+
+    @pytest.fixture
+    def open_manager(self, storage_path):
+        """Factory for managers on the scratch path, closed at teardown"""
+        managers = []
+
+        def open_manager():
+            manager = WatchlistManager(str(storage_path))
+            managers.append(manager)
+            return manager
+
+        yield open_manager
+        for manager in managers:
+            manager.close()
+
+    @pytest.fixture
+    def manager(self, open_manager):
+        """Create a manager with one custom watchlist"""
+        manager = open_manager()
+        manager.create_watchlist("Test", symbols=["VCB", "FPT"])
+        return manager
+
+    @staticmethod
+    def _find(manager, name):
+        return next(wl for wl in manager.get_all_watchlists() if wl.name == name)
+
+    def test_reload_replays_unflushed_changes(self, manager, open_manager):
+        """Test changes only in the journal survive a restart"""
+        watchlist = self._find(manager, "Test")
+        manager.add_symbol(watchlist.id, "HPG")
+        manager.remove_symbol(watchlist.id, "VCB")
+        deleted = manager.create_watchlist("Temp")
+        manager.delete_watchlist(deleted.id)
+
+        reloaded = open_manager()
+
+        assert reloaded.get_watchlist(watchlist.id).symbols == ["FPT", "HPG"]
+        assert reloaded.get_watchlist(deleted.id) is None
+        assert len(reloaded.watchlists) == len(manager.watchlists)
+        # Replayed entries are folded into the snapshot on load
+        assert not reloaded.journal_path.exists()
+
+    def test_reload_skips_partial_last_line(self, manager, open_manager):
+        """Test a journal line cut short by a crash is ignored"""
+        watchlist = self._find(manager, "Test")
+        manager.add_symbol(watchlist.id, "HPG")
+        with open(manager.journal_path, "ab") as f:
+            f.write(b'{"op":"add","wl":"' + watchlist.id.encode())
+
+        reloaded = open_manager()
+
+        assert reloaded.get_watchlist(watchlist.id).symbols == ["VCB", "FPT", "HPG"]
+
+    def test_reload_applies_compacting_journal_first(self, manager, open_manager):
+        """Test entries left aside by an interrupted compaction are replayed before newer ones"""
+        watchlist = self._find(manager, "Test")
+        manager.add_symbol(watchlist.id, "HPG")
+        manager._journal_file.close()
+        manager._journal_file = None
+        manager.journal_path.replace(manager._compacting_path)
+        manager.remove_symbol(watchlist.id, "HPG")
+
+        reloaded = open_manager()
+
+        assert reloaded.get_watchlist(watchlist.id).symbols == ["VCB", "FPT"]
+        assert not manager._compacting_path.exists()
+
+    def test_replay_is_idempotent(self, manager, open_manager):
+        """Test replaying entries the snapshot already holds changes nothing"""
+        watchlist = self._find(manager, "Test")
+        manager.add_symbol(watchlist.id, "HPG")
+        journal = manager.journal_path.read_bytes()
+        manager.flush()
+        # Crash after the snapshot was written but before the journal was dropped
+        manager._compacting_path.write_bytes(journal)
+
+        reloaded = open_manager()
+
+        assert reloaded.get_watchlist(watchlist.id).symbols == ["VCB", "FPT", "HPG"]
+        assert len(reloaded.watchlists) == len(manager.watchlists)
+
+    def test_close_stops_writer_and_compacts(self, manager, open_manager):
+        """Test close() joins the writer and leaves only the snapshot"""
+        watchlist = self._find(manager, "Test")
+        manager.add_symbol(watchlist.id, "HPG")
+
+        manager.close()
+
+        assert not manager._writer.is_alive()
+        assert not manager.journal_path.exists()
+        assert open_manager().get_watchlist(watchlist.id).symbols == ["VCB", "FPT", "HPG"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -90,6 +90,26 @@ class CacheManager:
         except Exception as e:
             logger.error(f"Error setting cache key {key}: {e}")
 
+    def set_encoded(self, key: str, payload: bytes, ttl: Optional[int] = None):
+        """
+        Set a value that is already JSON-encoded; get() decodes it like any other
+
+        Args:
+            key: Cache key
+            payload: JSON bytes
+            ttl: Time to live in seconds (None = no expiration)
+        """
+        if not self.redis_client:
+            return
+
+        try:
+            if ttl:
+                self.redis_client.setex(key, ttl, payload)
+            else:
+                self.redis_client.set(key, payload)
+        except Exception as e:
+            logger.error(f"Error setting cache key {key}: {e}")
+
     def delete(self, key: str):
         """Delete key from cache"""
         if not self.redis_client:
@@ -148,24 +168,33 @@ class CacheManager:
 
 
 # Decorator for caching function results
-def cached(ttl: int = 300, key_prefix: str = ""):
+def cached(ttl: int = 300, key_prefix: str = "", key_fn: Optional[Callable[..., str]] = None):
     """
     Decorator to cache function results
 
     Args:
         ttl: Time to live in seconds (default 5 minutes)
         key_prefix: Prefix for cache key
+        key_fn: Builds the full cache key from the call arguments
+            (replaces the default prefix/name/args key)
 
     Usage:
         @cached(ttl=60, key_prefix="price")
         def get_price(symbol):
             return expensive_api_call(symbol)
+
+        @cached(ttl=5, key_fn=lambda symbol: CacheKeys.price(symbol))
+        def get_price(symbol):
+            return expensive_api_call(symbol)
     """
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Generate cache key
-            cache_key = f"{key_prefix}:{func.__name__}:{str(args)}:{str(kwargs)}"
+            if key_fn:
+                cache_key = key_fn(*args, **kwargs)
+            else:
+                cache_key = f"{key_prefix}:{func.__name__}:{str(args)}:{str(kwargs)}"
 
             # Try to get from cache
             cached_value = cache_manager.get(cache_key)
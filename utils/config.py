@@ -52,6 +52,12 @@ class Settings(BaseSettings):
     telegram_chat_id: str = Field(default="")
     telegram_enabled: bool = Field(default=True)
 
+    # Alerts
+    alert_history_max: int = Field(default=10_000)
+
+    # AI Assistant
+    chat_history_turns: int = Field(default=10)
+
     # Redis Configuration
     redis_host: str = Field(default="localhost")
     redis_port: int = Field(default=6379)
@@ -59,6 +65,7 @@ class Settings(BaseSettings):
 
     # Database Configuration
     database_url: str = Field(default="sqlite:///./dnse_trading.db")
+    orders_db_path: str = Field(default="data/orders.db")
 
     # Logging
     log_level: str = Field(default="INFO")
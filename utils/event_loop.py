@@ -0,0 +1,24 @@
+"""
+Optional uvloop event loop
+asyncio.run() calls (order batches, notifications, screener loops) use uvloop when
+installed and the stock asyncio loop otherwise
+"""
+import asyncio
+
+from loguru import logger
+
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+def install_event_loop():
+    """Make uvloop the event loop for every thread that runs asyncio, if available"""
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+    else:
+        logger.warning("uvloop not installed, using the default asyncio event loop")
@@ -0,0 +1,13 @@
+"""
+Optional HTTP/2 support for httpx clients
+Clients fall back to HTTP/1.1 keep-alive when h2 is not installed
+"""
+from loguru import logger
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    logger.warning("h2 not installed, httpx clients will use HTTP/1.1 keep-alive")
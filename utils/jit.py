@@ -0,0 +1,25 @@
+"""
+Optional Numba JIT helpers
+Kernels decorated with njit run as plain Python when numba is not installed
+"""
+from loguru import logger
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not installed, numeric kernels will run in pure Python")
+
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator